@@ -0,0 +1,56 @@
+import os
+import tempfile
+
+def use_benchmark_database(name: str) -> str:
+    """
+    Points the application at a throwaway SQLite file unless DATABASE_URL is already set.
+
+    Must run before anything imports `database.config`.
+
+    Parameters:
+    - `name` (str): Base name of the SQLite file.
+
+    Returns:
+    - The sync database URL in use.
+    """
+
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.mkdtemp(prefix="apirest-bench-"), f"{name}.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+    return os.environ["DATABASE_URL"]
+
+def percentile(samples: list, fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of a list of samples.
+
+    Parameters:
+    - `samples` (list): The measured values.
+    - `fraction` (float): The percentile as a fraction, e.g. 0.95.
+    """
+
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+def report(name: str, latencies: list, elapsed: float) -> str:
+    """
+    Formats throughput and p50/p95/p99 latency of a run.
+
+    Parameters:
+    - `name` (str): Label of the scenario.
+    - `latencies` (list): Per-operation latencies, in seconds.
+    - `elapsed` (float): Wall-clock duration of the run, in seconds.
+    """
+
+    throughput = len(latencies) / elapsed if elapsed else 0.0
+    return (f"{name:<28} {len(latencies):>7} ops  {throughput:>10.1f} ops/s  "
+            f"p50 {percentile(latencies, 0.50) * 1000:>8.2f} ms  "
+            f"p95 {percentile(latencies, 0.95) * 1000:>8.2f} ms  "
+            f"p99 {percentile(latencies, 0.99) * 1000:>8.2f} ms")
@@ -0,0 +1,98 @@
+"""
+Concurrency benchmark: many parallel buyers ordering a single hot product.
+
+Run from the repository root:
+
+    python -m benchmarks.hot_product --buyers 200 --threads 16 --stock 150
+
+Without DATABASE_URL a throwaway SQLite file is used; point DATABASE_URL at
+MySQL to measure row-lock contention on the real engine.
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from time import perf_counter
+
+from benchmarks.common import report, use_benchmark_database
+
+use_benchmark_database("hot_product")
+
+import models
+from fastapi import HTTPException
+from database.config import SessionLocal, engine
+from models.product import Product
+from models.user import User
+from schemes.order import OrderBase
+from services.order import OrderService
+
+def seed(buyers: int, stock: int) -> None:
+    """
+    Creates the schema, one product with `stock` units and `buyers` users.
+    """
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add(Product(name="hot-product", description="Benchmark product", price=9.99,
+                       stock=stock, created_date=datetime.utcnow()))
+        db.add_all(User(username=f"buyer{i}", password="x", email=f"buyer{i}@example.com",
+                        name="Buyer", address="Nowhere") for i in range(buyers))
+        db.commit()
+    finally:
+        db.close()
+
+def buy(username: str):
+    """
+    Places one order for the hot product, returning its latency and outcome.
+    """
+
+    db = SessionLocal()
+    start = perf_counter()
+    try:
+        OrderService(db=db).create_order(new_order=OrderBase(product_name="hot-product", notes=None),
+                                         user_username=username)
+        outcome = "ordered"
+    except HTTPException as error:
+        db.rollback()
+        outcome = error.detail
+    finally:
+        db.close()
+    return perf_counter() - start, outcome
+
+def main():
+    """
+    Runs the buyers in parallel and checks the product was never oversold.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buyers", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--stock", type=int, default=150)
+    args = parser.parse_args()
+
+    seed(buyers=args.buyers, stock=args.stock)
+
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        results = list(executor.map(buy, (f"buyer{i}" for i in range(args.buyers))))
+    elapsed = perf_counter() - start
+
+    outcomes = {}
+    for _, outcome in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    db = SessionLocal()
+    remaining = db.query(Product.stock).filter(Product.name == "hot-product").scalar()
+    db.close()
+
+    print(report(f"create_order x{args.threads} threads", [latency for latency, _ in results], elapsed))
+    for outcome, count in sorted(outcomes.items()):
+        print(f"  {outcome}: {count}")
+    print(f"  remaining stock: {remaining}")
+
+    assert outcomes.get("ordered", 0) == min(args.buyers, args.stock), "orders do not match available stock"
+    assert remaining == max(args.stock - args.buyers, 0), "stock was oversold"
+
+if __name__ == "__main__":
+    main()
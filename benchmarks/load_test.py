@@ -0,0 +1,153 @@
+"""
+Load test of the main API scenarios, run offline against the application in process.
+
+Seeds a database with benchmarks.seed, then drives the ASGI application through
+an httpx client with a fixed number of concurrent workers per scenario:
+
+- login: `POST /token`
+- list_products: `GET /v1/products` with a price filter
+- create_order: `POST /v1/orders` for products the user has not ordered yet
+- order_history: `GET /v1/users/orders`
+
+Run from the repository root:
+
+    python -m benchmarks.load_test --users 1000 --products 5000 --orders 20000 --requests 500 --concurrency 16
+
+Use `--scenarios` to run a subset. Non-2xx responses are counted and reported.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+from time import perf_counter
+
+from benchmarks.common import report, use_benchmark_database
+
+use_benchmark_database("load_test")
+
+# Every simulated client shares one address, which the rate limiter would throttle.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx
+from sqlalchemy import select
+from database.config import SessionLocal
+from main import app
+from models.order import Order
+from benchmarks.seed import SEED_PASSWORD, product_name, seed_database, username
+
+SCENARIOS = ("login", "list_products", "create_order", "order_history")
+
+async def run_scenario(name: str, requests: list, concurrency: int, client: httpx.AsyncClient) -> list:
+    """
+    Sends the prepared requests with `concurrency` workers and prints the report line.
+
+    Parameters:
+    - `name` (str): Label of the scenario.
+    - `requests` (list): `(method, url, keyword arguments)` tuples, sent in order.
+    - `concurrency` (int): Number of concurrent workers.
+    - `client` (httpx.AsyncClient): Client bound to the application.
+
+    Returns:
+    - The responses, in the order of `requests`.
+    """
+
+    responses = [None] * len(requests)
+    latencies = []
+    pending = iter(range(len(requests)))
+
+    async def worker():
+        for index in pending:
+            method, url, kwargs = requests[index]
+            start = perf_counter()
+            responses[index] = await client.request(method, url, **kwargs)
+            latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - start
+
+    failures = sum(1 for response in responses if response.status_code >= 300)
+    print(report(name, latencies, elapsed) + (f"  {failures} failed" if failures else ""))
+
+    return responses
+
+def free_pairs(users: list, products: int, count: int, rng: random.Random) -> list:
+    """
+    Picks `count` (username, product name) pairs that have no order yet.
+    """
+
+    db = SessionLocal()
+    try:
+        taken = set(db.execute(select(Order.user_username, Order.product_name)
+                               .where(Order.user_username.in_(users))).all())
+    finally:
+        db.close()
+
+    pairs = set()
+    while len(pairs) < count:
+        pair = (rng.choice(users), product_name(rng.randrange(products)))
+        if pair not in taken:
+            pairs.add(pair)
+
+    return list(pairs)
+
+async def main_async(args) -> None:
+    rng = random.Random(args.seed)
+
+    created = seed_database(users=args.users, products=args.products, orders=args.orders, seed=args.seed)
+    print(", ".join(f"{count} {table}" for table, count in created.items()) + " seeded")
+
+    logins = [username(i) for i in rng.sample(range(args.users), min(args.logins, args.users))]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        responses = await run_scenario("login", [
+            ("POST", "/token", {"data": {"username": name, "password": SEED_PASSWORD}}) for name in logins
+        ], args.concurrency, client)
+        tokens = {name: response.json()["access_token"]
+                  for name, response in zip(logins, responses) if response.status_code == 200}
+
+        if not tokens:
+            raise SystemExit("No login succeeded, the other scenarios need a token")
+
+        def auth(name: str) -> dict:
+            return {"Authorization": f"Bearer {tokens[name]}"}
+
+        names = list(tokens)
+
+        if "list_products" in args.scenarios:
+            await run_scenario("list_products", [
+                ("GET", "/v1/products", {"params": {"limit": 50, "min_price": rng.randrange(0, 400)},
+                                         "headers": auth(rng.choice(names))})
+                for _ in range(args.requests)
+            ], args.concurrency, client)
+
+        if "create_order" in args.scenarios:
+            await run_scenario("create_order", [
+                ("POST", "/v1/orders", {"json": {"product_name": product, "notes": None}, "headers": auth(name)})
+                for name, product in free_pairs(names, args.products, args.requests, rng)
+            ], args.concurrency, client)
+
+        if "order_history" in args.scenarios:
+            await run_scenario("order_history", [
+                ("GET", "/v1/users/orders", {"params": {"limit": 50}, "headers": auth(rng.choice(names))})
+                for _ in range(args.requests)
+            ], args.concurrency, client)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--logins", type=int, default=50, help="login requests, one per distinct user")
+    parser.add_argument("--requests", type=int, default=500, help="requests per other scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
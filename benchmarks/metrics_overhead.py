@@ -0,0 +1,102 @@
+"""
+Overhead benchmark for the request metrics middleware.
+
+Drives a minimal FastAPI application directly through the ASGI interface, with
+and without MetricsMiddleware, and reports the added cost per request. The
+cost of a bare `RequestMetrics.finish` call is measured separately.
+
+Run from the repository root:
+
+    python -m benchmarks.metrics_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from benchmarks.common import use_benchmark_database
+
+use_benchmark_database("metrics_overhead")
+
+from fastapi import FastAPI
+from services.metrics import MetricsMiddleware, RequestMetrics
+
+def build_app(instrumented: bool) -> FastAPI:
+    """
+    Builds an application with a single cheap route, optionally instrumented.
+    """
+
+    app = FastAPI()
+
+    @app.get("/v1/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"item_id": item_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware, metrics=RequestMetrics())
+
+    return app
+
+async def drive(app, requests: int) -> float:
+    """
+    Sends `requests` GET requests through the ASGI interface and returns the elapsed seconds.
+    """
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = perf_counter()
+
+    for i in range(requests):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": f"/v1/items/{i}", "raw_path": f"/v1/items/{i}".encode(),
+            "root_path": "", "query_string": b"", "headers": [], "client": ("127.0.0.1", 1),
+            "server": ("testserver", 80), "app": app,
+        }
+        await app(scope, receive, send)
+
+    return perf_counter() - start
+
+def record_cost(calls: int) -> float:
+    """
+    Returns the seconds taken by one `start` plus `finish` pair on a registry.
+    """
+
+    metrics = RequestMetrics()
+    start = perf_counter()
+
+    for i in range(calls):
+        metrics.start()
+        metrics.finish(method="GET", route="/v1/items/{item_id}", status_code=200, duration=i % 100 / 1000)
+
+    return (perf_counter() - start) / calls
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+
+    for instrumented in (False, True, False, True):
+        app = build_app(instrumented=instrumented)
+        asyncio.run(drive(app, 500))
+        best = min(asyncio.run(drive(app, args.requests)) for _ in range(args.rounds))
+        results[instrumented] = min(best, results.get(instrumented, best))
+
+    plain = results[False] / args.requests
+    instrumented = results[True] / args.requests
+
+    print(f"{'without middleware':<28} {plain * 1e6:>8.2f} us/request")
+    print(f"{'with middleware':<28} {instrumented * 1e6:>8.2f} us/request")
+    print(f"{'overhead':<28} {(instrumented - plain) * 1e6:>8.2f} us/request "
+          f"({(instrumented - plain) / plain * 100:.1f}%)")
+    print(f"{'record only':<28} {record_cost(args.requests * 10) * 1e6:>8.2f} us/call")
+
+if __name__ == "__main__":
+    main()
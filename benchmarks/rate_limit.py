@@ -0,0 +1,56 @@
+"""
+Overhead benchmark for the token bucket rate limiter.
+
+Measures the cost of one check on a hot key, on keys spread over a working set
+that fits the limiter, and on always-new keys that force an eviction per
+check, and verifies memory stays bounded.
+
+Run from the repository root:
+
+    python -m benchmarks.rate_limit --checks 1000000 --maxsize 100000
+"""
+
+import argparse
+from time import perf_counter
+
+from benchmarks.common import use_benchmark_database
+
+use_benchmark_database("rate_limit")
+
+from services.rate_limit import TokenBucketLimiter
+
+def measure(limiter: TokenBucketLimiter, keys) -> float:
+    """
+    Returns the average seconds per `hit` over `keys`.
+    """
+
+    hit = limiter.hit
+    start = perf_counter()
+    count = 0
+
+    for key in keys:
+        hit(key)
+        count += 1
+
+    return (perf_counter() - start) / count
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=1000000)
+    parser.add_argument("--maxsize", type=int, default=100000)
+    args = parser.parse_args()
+
+    scenarios = (
+        ("single hot key", ("10.0.0.1" for _ in range(args.checks))),
+        ("working set in capacity", (f"10.0.{i % args.maxsize}" for i in range(args.checks))),
+        ("new key, evicting", (f"key-{i}" for i in range(args.checks))),
+    )
+
+    for name, keys in scenarios:
+        limiter = TokenBucketLimiter(name=name, capacity=100, period=60, maxsize=args.maxsize)
+        cost = measure(limiter, keys)
+        print(f"{name:<28} {cost * 1e9:>8.0f} ns/check  keys tracked {len(limiter):>8}  rejected {limiter.rejected}")
+        assert len(limiter) <= args.maxsize, "limiter grew past maxsize"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Synthetic data generator.
+
+Seeds users, products and orders through the application's models. The same
+`--seed` always produces the same rows, so runs are comparable.
+
+Run from the repository root:
+
+    python -m benchmarks.seed --users 1000 --products 5000 --orders 20000
+
+Without DATABASE_URL a throwaway SQLite file is used; set it to seed a local
+MySQL database instead.
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from benchmarks.common import use_benchmark_database
+
+use_benchmark_database("seed")
+
+import models
+from database.config import SessionLocal, engine
+from data_access.summary import SummaryAccess
+from models.order import Order
+from models.product import Product
+from models.user import User
+from services.hashing import crypt_context
+
+SEED_PASSWORD = "benchmark-password"
+
+BATCH_SIZE = 5000
+
+def username(index: int) -> str:
+    """
+    Returns the username of the seeded user number `index`.
+    """
+
+    return f"user{index}"
+
+def product_name(index: int) -> str:
+    """
+    Returns the name of the seeded product number `index`.
+    """
+
+    return f"product-{index}"
+
+def _insert(connection, table, rows: list) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        connection.execute(table.insert(), rows[start:start + BATCH_SIZE])
+
+def seed_database(users: int, products: int, orders: int, seed: int = 0, reset: bool = True) -> dict:
+    """
+    Fills the database with synthetic users, products and orders.
+
+    Every user gets the password `SEED_PASSWORD`, hashed once. Orders pair
+    distinct users and products, so the unique (user, product) constraint holds,
+    and their dates spread over the last year. Products get enough stock to
+    take orders during a load test. The sales summaries are rebuilt at the end.
+
+    Parameters:
+    - `users` (int): Number of users.
+    - `products` (int): Number of products.
+    - `orders` (int): Number of orders; capped at `users * products`.
+    - `seed` (int): Seed of the random generator.
+    - `reset` (bool): Whether to drop and recreate the tables first.
+
+    Returns:
+    - The number of rows created per table.
+    """
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password = crypt_context.hash(SEED_PASSWORD)
+
+    if reset:
+        models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+
+    prices = [round(rng.uniform(1, 500), 2) for _ in range(products)]
+
+    pairs = set()
+    orders = min(orders, users * products)
+    while len(pairs) < orders:
+        pairs.add((rng.randrange(users), rng.randrange(products)))
+
+    order_rows = []
+    for user_index, product_index in sorted(pairs):
+        order_date = now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        order_rows.append({
+            "user_username": username(user_index), "product_name": product_name(product_index),
+            "order_date": order_date, "dead_line": order_date + timedelta(days=7),
+            "status": "Delivered" if order_date < now - timedelta(days=7) else "On the way",
+            "total": prices[product_index], "notes": None,
+        })
+
+    with engine.begin() as connection:
+        _insert(connection, User.__table__, [
+            {"username": username(i), "password": password, "email": f"{username(i)}@example.com",
+             "name": f"User {i}", "address": f"{i} Benchmark Street"}
+            for i in range(users)
+        ])
+        _insert(connection, Product.__table__, [
+            {"name": product_name(i), "description": f"Synthetic product {i}", "price": prices[i],
+             "stock": rng.randrange(1000, 10000), "created_date": now - timedelta(minutes=i)}
+            for i in range(products)
+        ])
+        _insert(connection, Order.__table__, order_rows)
+
+    db = SessionLocal()
+    try:
+        SummaryAccess(db=db).rebuild()
+    finally:
+        db.close()
+
+    return {"users": users, "products": products, "orders": len(order_rows)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = perf_counter()
+    created = seed_database(users=args.users, products=args.products, orders=args.orders, seed=args.seed)
+    elapsed = perf_counter() - start
+
+    print(", ".join(f"{count} {table}" for table, count in created.items()) + f" seeded in {elapsed:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Serialization benchmark for the product listing.
+
+Compares the response_model path (ORM rows validated through the pydantic
+schemes and encoded by FastAPI) with the fast path (column-only query encoded
+straight to JSON) at several result sizes. Both include the query.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+from datetime import datetime
+from time import perf_counter
+
+from benchmarks.common import use_benchmark_database
+
+use_benchmark_database("serialization")
+
+import models
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from database.config import SessionLocal, engine
+from data_access.product import PRODUCT_COLUMNS
+from models.product import Product
+from schemes.product import ProductPage
+from services.serialization import dumps, orjson
+
+def seed(rows: int) -> None:
+    """
+    Recreates the products table with `rows` products.
+    """
+
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(Product.__table__.insert(), [
+            {"name": f"product-{i}", "description": "Benchmark product", "price": i % 1000 + 0.99,
+             "stock": i % 50, "created_date": now}
+            for i in range(rows)
+        ])
+
+def response_model_path(db) -> bytes:
+    """
+    ORM objects validated into ProductPage and encoded the way FastAPI does for response_model.
+    """
+
+    products = db.execute(select(Product).order_by(Product.product_id)).scalars().all()
+    page = ProductPage(items=products, next_cursor=None)
+    return json.dumps(jsonable_encoder(page)).encode()
+
+def fast_path(db) -> bytes:
+    """
+    Column-only rows encoded directly, as GET /v1/products does.
+    """
+
+    statement = select(*PRODUCT_COLUMNS).order_by(Product.product_id)
+    products = [dict(row) for row in db.execute(statement).mappings()]
+    return dumps({"items": products, "next_cursor": None})
+
+def measure(function, repeat: int) -> float:
+    """
+    Returns the best wall-clock time of `repeat` runs, each on a fresh session.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            start = perf_counter()
+            function(db)
+            best = min(best, perf_counter() - start)
+        finally:
+            db.close()
+    return best
+
+def main():
+    """
+    Seeds each size and prints the time of both paths and the speedup.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+
+    for size in args.sizes:
+        seed(rows=size)
+        slow = measure(response_model_path, repeat=args.repeat)
+        fast = measure(fast_path, repeat=args.repeat)
+        print(f"{size:>7} rows  response_model {slow * 1000:>9.1f} ms  fast path {fast * 1000:>9.1f} ms  "
+              f"speedup x{slow / fast:.1f}")
+
+if __name__ == "__main__":
+    main()
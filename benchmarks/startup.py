@@ -0,0 +1,61 @@
+"""
+Worker startup benchmark.
+
+Starts fresh interpreters that import `main`, run the startup handlers and
+wait for the readiness probe, and reports how long each milestone took.
+
+Run from the repository root:
+
+    python -m benchmarks.startup --runs 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from statistics import median
+
+from benchmarks.common import use_benchmark_database
+
+use_benchmark_database("startup")
+
+import models
+from database.config import engine
+
+WORKER = """
+import json, time
+from time import perf_counter
+start = perf_counter()
+from fastapi.testclient import TestClient
+from main import app
+from services.readiness import readiness
+imported = perf_counter()
+with TestClient(app):
+    while not readiness.ready:
+        time.sleep(0.001)
+    ready = perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "ready_ms": (ready - start) * 1000,
+                  "startup_ms": readiness.startup_ms, "warmup_ms": readiness.warmup_ms}))
+"""
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, "-c", WORKER], env=os.environ, capture_output=True,
+                                text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    for field, label in (("import_ms", "import main"), ("startup_ms", "startup handlers done"),
+                         ("warmup_ms", "pools warm (ready)"), ("ready_ms", "ready seen by the probe")):
+        values = [run[field] for run in runs]
+        print(f"{label:<28} median {median(values):>8.1f} ms  max {max(values):>8.1f} ms")
+
+if __name__ == "__main__":
+    main()
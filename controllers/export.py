@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from schemes.export import ExportFormat
+from schemes.user import User
+from services.auth import AuthService
+from services.export import MEDIA_TYPES, ExportService
+from database.get_db import get_db, read_router
+from database.routing import sticky_key
+
+export_router = APIRouter(
+    prefix="/v1/export",
+    tags=["Export"]
+)
+
+db: Session = Depends(get_db)
+
+auth_service = AuthService(db=db)
+
+@export_router.get("/products")
+def export_products(request: Request,
+                    format: ExportFormat = ExportFormat.ndjson,
+                    after_id: int | None = Query(None, ge=0),
+                    user: User = Depends(auth_service.get_current_user)):
+    """
+    Stream every product as NDJSON or CSV.
+
+    Parameters:
+    - `request` (Request): The incoming request, used to pick the database to read from.
+    - `format` (ExportFormat): `ndjson` (default) or `csv`.
+    - `after_id` (int | None): Only products with a higher product_id, for incremental syncs.
+    - `user` (User): The authenticated user.
+
+    Returns:
+    - A streaming response, one chunk per batch of rows.
+    """
+    
+    export_service = ExportService(session_factory=read_router.session_factory(sticky_key(request)))
+    
+    return StreamingResponse(
+        export_service.stream_products(export_format=format, after_id=after_id),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format.value}"'}
+    )
+
+@export_router.get("/orders")
+def export_orders(request: Request,
+                  format: ExportFormat = ExportFormat.ndjson,
+                  after_id: int | None = Query(None, ge=0),
+                  user: User = Depends(auth_service.get_current_user)):
+    """
+    Stream every order of the authenticated user as NDJSON or CSV.
+
+    Parameters:
+    - `request` (Request): The incoming request, used to pick the database to read from.
+    - `format` (ExportFormat): `ndjson` (default) or `csv`.
+    - `after_id` (int | None): Only orders with a higher order_id, for incremental syncs.
+    - `user` (User): The authenticated user.
+
+    Returns:
+    - A streaming response, one chunk per batch of rows.
+    """
+    
+    export_service = ExportService(session_factory=read_router.session_factory(sticky_key(request)))
+    
+    return StreamingResponse(
+        export_service.stream_orders(user_username=user.username, export_format=format, after_id=after_id),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{format.value}"'}
+    )
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends
+from typing import List
+
+from fastapi import APIRouter, Depends, Header, Request
 from sqlalchemy.orm import Session
 from schemes.user import User
-from schemes.order import Order, OrderBase
+from schemes.order import CheckoutRequest, Order, OrderBase, OrderWithProduct
 from services.order import OrderService
 from services.auth import AuthService
-from database.get_db import get_db
+from services.idempotency import IDEMPOTENCY_KEY_MAX_LENGTH, IdempotencyService
+from services.rate_limit import client_ip, enforce_limits, order_ip_limiter, order_user_limiter
+from database.get_db import get_db, get_reader_db
 
 order_router = APIRouter(
     prefix="/v1/orders",
@@ -15,28 +19,99 @@ db: Session = Depends(get_db)
 
 auth_service = AuthService(db=db)
 
-@order_router.post("", response_model=Order)
+def limit_order_creation(request: Request, user: User = Depends(auth_service.get_current_user)):
+    """
+    Rate limits order creation per client address and per authenticated user.
+    """
+    
+    enforce_limits((order_ip_limiter, client_ip(request)), (order_user_limiter, user.username))
+
+@order_router.post("", response_model=Order, dependencies=[Depends(limit_order_creation)])
 def new_order(new_order: OrderBase, 
+              request: Request,
               user: User = Depends(auth_service.get_current_user),
-              db: Session = Depends(get_db)):
+              db: Session = Depends(get_db),
+              idempotency_key: str | None = Header(None, max_length=IDEMPOTENCY_KEY_MAX_LENGTH)):
     """
     Create a new order.
 
+    A retry sent with the same `Idempotency-Key` header replays the first
+    response, flagged with `Idempotent-Replayed: true`, instead of creating
+    the order again.
+
     Parameters:
     - `new_order` (OrderBase): The order details.
+    - `request` (Request): The incoming request.
     - `user` (User): The authenticated user.
     - `db` (Session): The SQLAlchemy database session.
+    - `idempotency_key` (str | None): Client key making retries safe.
 
     Returns:
     - The created order.
 
     Raises:
-    - HTTPException: If the product is not found or if the user already has an active order with the product.
+    - HTTPException: If the product is not found or if the user already has an active order with the product,
+      or 429 if the client or user created too many orders recently. 409 if a request with the same
+      idempotency key is still running, 422 if the key was used with a different order.
     """
     
     user_username = user.username
     
+    order_service = OrderService(db=db)
+    idempotency_service = IdempotencyService(db=db)
+    
+    return idempotency_service.run(
+        request=request, username=user_username, key=idempotency_key, payload=new_order,
+        handler=lambda: order_service.create_order(new_order=new_order, user_username=user_username),
+        response_model=Order,
+    )
+
+@order_router.post("/checkout", response_model=List[Order], dependencies=[Depends(limit_order_creation)])
+def checkout(checkout_request: CheckoutRequest,
+             user: User = Depends(auth_service.get_current_user),
+             db: Session = Depends(get_db)):
+    """
+    Create one order per product of a cart, all in one transaction.
+
+    Parameters:
+    - `checkout_request` (CheckoutRequest): The products to order, with their notes.
+    - `user` (User): The authenticated user.
+    - `db` (Session): The SQLAlchemy database session.
+
+    Returns:
+    - The created orders.
+
+    Raises:
+    - HTTPException: 409 with a per-item error list if any product is not found,
+      already ordered or repeated; no order is created in that case. 429 if
+      the client or user created too many orders recently.
+    """
+    
+    order_service = OrderService(db=db)
+    
+    return order_service.checkout(items=checkout_request.items, user_username=user.username)
+
+@order_router.get("/{order_id}", response_model=OrderWithProduct)
+def get_order(order_id: int,
+              user: User = Depends(auth_service.get_current_user),
+              db: Session = Depends(get_reader_db)):
+    """
+    Retrieve one of the authenticated user's orders with its product details.
+
+    The order and its product are loaded with a single joined query.
+
+    Parameters:
+    - `order_id` (int): The order identifier.
+    - `user` (User): The authenticated user.
+    - `db` (Session): The SQLAlchemy database session.
+
+    Returns:
+    - The order with the product's name, description and price embedded.
+
+    Raises:
+    - HTTPException: 404 if the order does not exist or belongs to another user.
+    """
+    
     order_service = OrderService(db=db)
     
-    return order_service.create_order(new_order=new_order, user_username=user_username)
-    
\ No newline at end of file
+    return order_service.get_order(order_id=order_id, user_username=user.username)
@@ -1,13 +1,19 @@
 from datetime import datetime
-from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from schemes.user import User
-from schemes.product import Product, ProductBase, ProductCreate
+from schemes.product import (BulkProductResult, Product, ProductBase, ProductCreate, ProductFilter, ProductPage,
+                             ProductSortField, SortOrder)
 from services.auth import AuthService
-from services.product import ProductService
-from database.get_db import get_db
+from services.idempotency import IDEMPOTENCY_KEY_MAX_LENGTH, AsyncIdempotencyService
+from services.conditional import etag_headers, is_not_modified, not_modified_response
+from services.serialization import FastJSONResponse
+from services.product import (BULK_BATCH_SIZE, AsyncProductService, ProductService, iter_ndjson_lines,
+                              parse_product_payload)
+from database.get_db import get_async_db, get_db, get_reader_db
 
 product_router = APIRouter(
     prefix="/v1/products",
@@ -19,51 +25,136 @@ db: Session = Depends(get_db)
 auth_service = AuthService(db=db)
 
 @product_router.post("", response_model=Product)
-async def create_product(new_product: ProductBase, user: User = Depends(auth_service.get_current_user), 
-                         db: Session = Depends(get_db)):
+async def create_product(new_product: ProductBase, request: Request,
+                         user: User = Depends(auth_service.get_current_user), 
+                         db: AsyncSession = Depends(get_async_db),
+                         idempotency_key: str | None = Header(None, max_length=IDEMPOTENCY_KEY_MAX_LENGTH)):
     
     """
     Create a new product.
 
+    A retry sent with the same `Idempotency-Key` header replays the first
+    response instead of creating the product again.
+
     Parameters:
     - `new_product` (ProductBase): The base information for the new product.
+    - `request` (Request): The incoming request.
     - `user` (User): The current authenticated user.
-    - `db` (Session): The SQLAlchemy database session.
+    - `db` (AsyncSession): The SQLAlchemy async database session.
+    - `idempotency_key` (str | None): Client key making retries safe.
 
     Returns:
     - The created product.
 
     Raises:
-    - HTTPException: If there is an issue creating the product.
+    - HTTPException: If there is an issue creating the product, 409 if a request with the same
+      idempotency key is still running, or 422 if the key was used with a different product.
     """
     
     new_product_with_date = ProductCreate(**new_product.dict(), created_date=datetime.utcnow())
     
+    product_service = AsyncProductService(db=db)
+    idempotency_service = AsyncIdempotencyService(db=db)
+    
+    return await idempotency_service.run(
+        request=request, username=user.username, key=idempotency_key, payload=new_product,
+        handler=lambda: product_service.create_product(new_product=new_product_with_date),
+        response_model=Product,
+    )
+
+@product_router.post("/bulk", response_model=BulkProductResult)
+async def bulk_create_products(request: Request,
+                               batch_size: int = Query(BULK_BATCH_SIZE, ge=1, le=10000),
+                               user: User = Depends(auth_service.get_current_user),
+                               db: Session = Depends(get_db)):
+    """
+    Create many products at once.
+
+    The body is either a JSON array of products or, with the content type
+    `application/x-ndjson`, one product object per line. NDJSON is read as it
+    arrives and inserted batch by batch, so the body is never held in memory
+    whole; a line that is not valid JSON is reported as a rejected row.
+
+    Parameters:
+    - `request` (Request): The incoming request, read as the raw payload.
+    - `batch_size` (int): Number of rows checked and inserted per batch.
+    - `user` (User): The current authenticated user.
+    - `db` (Session): The SQLAlchemy database session.
+
+    Returns:
+    - The number of products created and the rows rejected, with the reason.
+
+    Raises:
+    - HTTPException: If a JSON array payload is not valid JSON.
+    """
+    
     product_service = ProductService(db=db)
     
-    return product_service.create_product(new_product=new_product_with_date)
+    if "ndjson" in request.headers.get("content-type", ""):
+        return await product_service.bulk_create_products_from_lines(lines=iter_ndjson_lines(request.stream()),
+                                                                     batch_size=batch_size)
+    
+    rows = parse_product_payload(payload=await request.body())
+    
+    return await run_in_threadpool(product_service.bulk_create_products, rows=rows, batch_size=batch_size)
 
-@product_router.get("", response_model=List[Product])
-def get_products(user: User = Depends(auth_service.get_current_user), 
-                 db: Session = Depends(get_db)):
+@product_router.get("", response_model=ProductPage)
+def get_products(request: Request,
+                 limit: int = Query(50, ge=1, le=500),
+                 cursor: str | None = None,
+                 sort_by: ProductSortField = ProductSortField.product_id,
+                 order: SortOrder = SortOrder.asc,
+                 min_price: float | None = Query(None, ge=0),
+                 max_price: float | None = Query(None, ge=0),
+                 min_stock: int | None = Query(None, ge=0),
+                 max_stock: int | None = Query(None, ge=0),
+                 created_from: datetime | None = None,
+                 created_to: datetime | None = None,
+                 user: User = Depends(auth_service.get_current_user), 
+                 db: Session = Depends(get_reader_db)):
     """
-    Retrieve all products.
+    Retrieve one page of products.
 
     This endpoint requires authentication. Only authenticated users can access it.
+    Pages are keyed on the sort column and `product_id`; pass the returned
+    `next_cursor` back as `cursor` to get the following page.
+    The response carries an ETag derived from cheap aggregates of the products
+    table; a request whose `If-None-Match` matches it gets a 304 without any
+    product being loaded. Rows are fetched as columns and encoded straight to
+    JSON; `ProductPage` only documents the response shape.
 
     Args:
+        request (Request): The incoming request, used for conditional headers.
+        limit (int): Maximum number of products in the page.
+        cursor (str | None): Cursor returned with the previous page.
+        sort_by (ProductSortField): Column used to sort the products.
+        order (SortOrder): Sort direction.
+        min_price, max_price (float | None): Price range filter.
+        min_stock, max_stock (int | None): Stock range filter.
+        created_from, created_to (datetime | None): Creation date range filter.
         user (User): The authenticated user obtained from the JWT token.
         db (Session): The SQLAlchemy database session.
 
     Returns:
-        List[Product]: A list of products.
+        ProductPage: The products of the page and the cursor of the next one,
+        or an empty 304 response if the client's copy is current.
 
     Raises:
-        HTTPException: Returns 401 UNAUTHORIZED if the user is not authenticated.
+        HTTPException: Returns 401 UNAUTHORIZED if the user is not authenticated,
+        400 BAD REQUEST if the cursor is invalid.
     """
     
     product_service = ProductService(db=db)
     
-    return product_service.get_products()
+    etag = product_service.get_products_etag(variant=request.url.query)
+    
+    if is_not_modified(request=request, etag=etag):
+        return not_modified_response(etag=etag)
+    
+    filters = ProductFilter(min_price=min_price, max_price=max_price, min_stock=min_stock,
+                            max_stock=max_stock, created_from=created_from, created_to=created_to)
+    
+    page = product_service.get_products(filters=filters, sort_by=sort_by, order=order,
+                                        limit=limit, cursor=cursor)
     
-    
\ No newline at end of file
+    return FastJSONResponse(content=page, headers=etag_headers(etag))
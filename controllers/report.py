@@ -0,0 +1,70 @@
+from datetime import date, datetime, timedelta
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from schemes.user import User
+from schemes.report import DailyRevenue, ProductSales
+from services.report import ReportService
+from services.auth import AuthService
+from database.get_db import get_db, get_reader_db
+
+report_router = APIRouter(
+    prefix="/v1/reports",
+    tags=["Reports"]
+)
+
+db: Session = Depends(get_db)
+
+auth_service = AuthService(db=db)
+
+@report_router.get("/sales-by-product", response_model=List[ProductSales])
+def get_sales_by_product(limit: int = Query(50, ge=1, le=500),
+                         user: User = Depends(auth_service.get_current_user),
+                         db: Session = Depends(get_reader_db)):
+    """
+    Best selling products by revenue.
+
+    Read from the product_sales summary table, which order creation keeps up
+    to date, so no aggregation over the orders table is run.
+
+    Parameters:
+    - `limit`: Maximum number of products.
+    - `user` (User): The authenticated user.
+    - `db` (Session): The SQLAlchemy database session.
+
+    Returns:
+    - Orders count and revenue per product, highest revenue first.
+    """
+    
+    report_service = ReportService(db=db)
+    
+    return report_service.get_product_sales(limit=limit)
+
+@report_router.get("/revenue-by-day", response_model=List[DailyRevenue])
+def get_revenue_by_day(date_from: date | None = None,
+                       date_to: date | None = None,
+                       user: User = Depends(auth_service.get_current_user),
+                       db: Session = Depends(get_reader_db)):
+    """
+    Revenue per day, read from the daily_revenue summary table.
+
+    Parameters:
+    - `date_from`: First day of the range, 30 days before `date_to` by default.
+    - `date_to`: Last day of the range, today (UTC) by default.
+    - `user` (User): The authenticated user.
+    - `db` (Session): The SQLAlchemy database session.
+
+    Returns:
+    - Orders count and revenue of every day with orders in the range, oldest first.
+
+    Raises:
+    - HTTPException: 400 if `date_from` is after `date_to`.
+    """
+    
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=30)
+    
+    report_service = ReportService(db=db)
+    
+    return report_service.get_daily_revenue(date_from=date_from, date_to=date_to)
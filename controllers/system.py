@@ -0,0 +1,91 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from database.config import async_engine, async_replica_engines, engine, replica_engines
+from database.pool import pool_status
+from schemes.system import CachesStatus, PoolsStatus, ReadinessStatus, SchedulerStatus
+from services.auth import user_cache
+from services.catalog import product_catalog
+from services.idempotency import idempotency_store
+from services.metrics import request_metrics
+from services.rate_limit import prometheus_lines as rate_limit_lines
+from services.readiness import readiness
+from services.scheduler import order_scheduler
+
+system_router = APIRouter(
+    prefix="/v1/system",
+    tags=["System"]
+)
+
+metrics_router = APIRouter(
+    tags=["System"]
+)
+
+@system_router.get("/pool", response_model=PoolsStatus, response_model_by_alias=True)
+def get_pool_status():
+    """
+    Endpoint to inspect the database connection pools.
+
+    Returns:
+    - Checked-out connections, overflow in use, checkout wait times and timeouts
+      for the sync and async engines.
+    """
+    
+    return PoolsStatus(sync=pool_status(engine), async_=pool_status(async_engine))
+
+@system_router.get("/cache", response_model=CachesStatus)
+def get_cache_status():
+    """
+    Endpoint to inspect the in-process caches.
+
+    Returns:
+    - Size and hit/miss counters of the product catalog and user caches.
+    """
+    
+    return CachesStatus(product_catalog=product_catalog.stats(), users=user_cache.stats())
+
+@system_router.get("/ready", response_model=ReadinessStatus, responses={503: {"model": ReadinessStatus}})
+def get_readiness():
+    """
+    Readiness probe for the load balancer or orchestrator.
+
+    Returns:
+    - 200 once both connection pools hold a connection that answered a ping,
+      503 before that; both with the startup and warmup times of the worker.
+    """
+    
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=readiness.status())
+
+@system_router.get("/scheduler", response_model=SchedulerStatus)
+def get_scheduler_status():
+    """
+    Endpoint to inspect the order status scheduler.
+
+    Returns:
+    - Its configuration, run counters and the orders moved per transition.
+    """
+    
+    return order_scheduler.stats()
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Endpoint scraped by Prometheus.
+
+    Returns:
+    - Per-route latency histograms and request counters, requests in flight,
+      the connection pool statistics of every engine, the order scheduler
+      counters, the rate limiter rejections and the idempotency key replays,
+      in the text exposition format.
+    """
+    
+    engines = {"sync": engine, "async": async_engine,
+               **{f"replica{index}": replica for index, replica in enumerate(replica_engines)},
+               **{f"async_replica{index}": replica for index, replica in enumerate(async_replica_engines)}}
+    content = request_metrics.render(engines=engines)
+    content += "\n".join(order_scheduler.prometheus_lines() + rate_limit_lines()
+                          + idempotency_store.prometheus_lines()) + "\n"
+    
+    return PlainTextResponse(
+        content=content,
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends
-from services.user import UserService
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Request
+from services.user import AsyncUserService, UserService
 from services.auth import AuthService
+from services.conditional import etag_headers, is_not_modified, not_modified_response
+from services.serialization import FastJSONResponse
 from schemes.user import User, UserCreate
-from schemes.order import Order
-from database.get_db import get_db
+from schemes.order import OrderFilter, OrderPage, OrderWithProductPage
+from database.get_db import get_async_reader_db, get_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 user_router = APIRouter(
@@ -35,23 +40,94 @@ def create_user(new_user: UserCreate, db: Session = Depends(get_db)):
     
     return user_service.create_user(new_user=new_user)
 
-@user_router.get("/orders")
-async def get_orders(user: User = Depends(auth_service.get_current_user), 
-                     db: Session = Depends(get_db)):
+@user_router.get("/orders", response_model=OrderPage)
+async def get_orders(request: Request,
+                     limit: int = Query(50, ge=1, le=500),
+                     cursor: str | None = None,
+                     status: str | None = None,
+                     date_from: datetime | None = None,
+                     date_to: datetime | None = None,
+                     user: User = Depends(auth_service.get_current_user), 
+                     db: AsyncSession = Depends(get_async_reader_db)):
     """
-    Endpoint to retrieve orders for the authenticated user.
+    Endpoint to retrieve one page of orders for the authenticated user, newest first.
+
+    Pass the returned `next_cursor` back as `cursor` to get the following page.
+    The response carries an ETag derived from the user's order count and highest
+    order id; a request whose `If-None-Match` matches it gets a 304 without any
+    order being loaded. Rows are fetched as columns and encoded straight to
+    JSON; `OrderPage` only documents the response shape.
 
     Parameters:
+    - `request`: The incoming request, used for conditional headers.
+    - `limit`: Maximum number of orders in the page.
+    - `cursor`: Cursor returned with the previous page.
+    - `status`: Only orders with this status.
+    - `date_from`, `date_to`: Order date range filter.
     - `user`: Current user obtained from the JWT token.
-    - `db`: SQLAlchemy database session.
+    - `db`: SQLAlchemy async database session.
 
     Returns:
-    - List of orders associated with the authenticated user.
+    - OrderPage with the orders of the page and the cursor of the next one, or
+      an empty 304 response if the client's copy is current.
 
     Raises:
     - HTTPException: If there is an error retrieving the orders.
     """
     
-    user_service = UserService(db=db)
+    user_service = AsyncUserService(db=db)
+    
+    etag = await user_service.get_orders_etag(username=user.username, variant=request.url.query)
+    
+    if is_not_modified(request=request, etag=etag):
+        return not_modified_response(etag=etag)
+    
+    filters = OrderFilter(status=status, date_from=date_from, date_to=date_to)
+    
+    page = await user_service.get_orders(username=user.username, filters=filters, limit=limit, cursor=cursor)
+    
+    return FastJSONResponse(content=page, headers=etag_headers(etag))
+
+@user_router.get("/orders/detailed", response_model=OrderWithProductPage)
+async def get_orders_detailed(request: Request,
+                              limit: int = Query(50, ge=1, le=500),
+                              cursor: str | None = None,
+                              status: str | None = None,
+                              date_from: datetime | None = None,
+                              date_to: datetime | None = None,
+                              user: User = Depends(auth_service.get_current_user), 
+                              db: AsyncSession = Depends(get_async_reader_db)):
+    """
+    Endpoint to retrieve one page of orders for the authenticated user with the
+    name, description and price of each product embedded, newest first.
+
+    Orders and products are fetched with one joined query per page. Pagination,
+    filters and conditional requests behave as in `GET /v1/users/orders`.
+
+    Parameters:
+    - `request`: The incoming request, used for conditional headers.
+    - `limit`: Maximum number of orders in the page.
+    - `cursor`: Cursor returned with the previous page.
+    - `status`: Only orders with this status.
+    - `date_from`, `date_to`: Order date range filter.
+    - `user`: Current user obtained from the JWT token.
+    - `db`: SQLAlchemy async database session.
+
+    Returns:
+    - OrderWithProductPage with the orders of the page and the cursor of the
+      next one, or an empty 304 response if the client's copy is current.
+    """
+    
+    user_service = AsyncUserService(db=db)
+    
+    etag = await user_service.get_orders_etag(username=user.username, variant=f"detailed?{request.url.query}")
+    
+    if is_not_modified(request=request, etag=etag):
+        return not_modified_response(etag=etag)
+    
+    filters = OrderFilter(status=status, date_from=date_from, date_to=date_to)
+    
+    page = await user_service.get_orders_with_products(username=user.username, filters=filters, limit=limit,
+                                                       cursor=cursor)
     
-    return await user_service.get_orders(username=user.username)
\ No newline at end of file
+    return FastJSONResponse(content=page, headers=etag_headers(etag))
@@ -0,0 +1,47 @@
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_UPSERT_INSERTS = {"mysql": mysql.insert, "postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def increment_counters(db: Session, model, keys: dict, **increments) -> None:
+    """
+    Adds to the counters of one row, creating it if missing, with a single upsert and without committing.
+
+    Dialects without an upsert fall back to an UPDATE followed, if no row
+    matched, by an INSERT.
+
+    Parameters:
+    - `db` (Session): The SQLAlchemy database session.
+    - `model`: The mapped class of the counters table.
+    - `keys` (dict): Primary key values of the row.
+    - `increments`: Amount added to each counter column.
+    """
+
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    insert_for_dialect = _UPSERT_INSERTS.get(dialect)
+
+    if insert_for_dialect is None:
+        result = db.execute(
+            update(table)
+            .where(*(table.c[name] == value for name, value in keys.items()))
+            .values({name: table.c[name] + amount for name, amount in increments.items()})
+        )
+        if result.rowcount == 0:
+            db.execute(insert(table).values(**keys, **increments))
+        return
+
+    statement = insert_for_dialect(table).values(**keys, **increments)
+
+    if dialect == "mysql":
+        statement = statement.on_duplicate_key_update(
+            {name: table.c[name] + statement.inserted[name] for name in increments}
+        )
+    else:
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: table.c[name] + statement.excluded[name] for name in increments},
+        )
+
+    db.execute(statement)
@@ -0,0 +1,192 @@
+from datetime import datetime
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models.idempotency import IdempotencyKey
+
+def _delete_stale_statement(key: str, expired_before: datetime, abandoned_before: datetime):
+    """
+    Builds the DELETE of a key that expired, or that was claimed and never completed.
+    """
+
+    return delete(IdempotencyKey).where(
+        IdempotencyKey.key == key,
+        or_(IdempotencyKey.created_at < expired_before,
+            and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.created_at < abandoned_before)),
+    )
+
+def _complete_statement(key: str, status_code: int, body: str):
+    return (update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .values(status_code=status_code, body=body))
+
+def _release_statement(key: str):
+    return delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None))
+
+class IdempotencyAccess:
+    """
+    Class to handle the stored responses of idempotency keys.
+
+    Attributes:
+        db (Session): The SQLAlchemy database session.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initialize IdempotencyAccess with a database session.
+
+        Parameters:
+            db (Session): The SQLAlchemy database session.
+        """
+
+        self.db = db
+
+    def get_key(self, key: str):
+        """
+        Retrieve a key, completed or still running.
+
+        Parameters:
+            key (str): The scoped idempotency key.
+
+        Returns:
+            IdempotencyKey | None: The key, if any.
+        """
+
+        return self.db.execute(select(IdempotencyKey).where(IdempotencyKey.key == key)).scalar_one_or_none()
+
+    def claim_key(self, key: str, request_hash: str, expired_before: datetime, abandoned_before: datetime) -> None:
+        """
+        Insert a key without a response and commit, replacing the row of the
+        key if it expired or was abandoned by a request that never completed.
+
+        Parameters:
+            key (str): The scoped idempotency key.
+            request_hash (str): SHA-256 of the request payload.
+            expired_before (datetime): Rows claimed before this have expired.
+            abandoned_before (datetime): Rows without a response claimed before this are abandoned.
+
+        Raises:
+            IntegrityError: If the key is already claimed.
+        """
+
+        self.db.execute(_delete_stale_statement(key=key, expired_before=expired_before,
+                                                abandoned_before=abandoned_before))
+        self.db.add(IdempotencyKey(key=key, request_hash=request_hash, created_at=datetime.utcnow()))
+        self.db.commit()
+
+    def complete_key(self, key: str, status_code: int, body: str) -> None:
+        """
+        Store the response of a claimed key and commit.
+
+        Parameters:
+            key (str): The scoped idempotency key.
+            status_code (int): Status code of the response.
+            body (str): JSON body of the response.
+        """
+
+        self.db.execute(_complete_statement(key=key, status_code=status_code, body=body))
+        self.db.commit()
+
+    def release_key(self, key: str) -> None:
+        """
+        Delete a claimed key that has no response and commit, so it can be retried.
+
+        Parameters:
+            key (str): The scoped idempotency key.
+        """
+
+        self.db.execute(_release_statement(key=key))
+        self.db.commit()
+
+    def delete_expired(self, created_before: datetime) -> int:
+        """
+        Delete the keys claimed before a date and commit.
+
+        Parameters:
+            created_before (datetime): Keys claimed before this are deleted.
+
+        Returns:
+            int: The number of keys deleted.
+        """
+
+        result = self.db.execute(delete(IdempotencyKey).where(IdempotencyKey.created_at < created_before))
+        self.db.commit()
+
+        return result.rowcount
+
+class AsyncIdempotencyAccess:
+    """
+    Class to handle the stored responses of idempotency keys on an async session.
+
+    Attributes:
+        db (AsyncSession): The SQLAlchemy async database session.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Initialize AsyncIdempotencyAccess with an async database session.
+
+        Parameters:
+            db (AsyncSession): The SQLAlchemy async database session.
+        """
+
+        self.db = db
+
+    async def get_key(self, key: str):
+        """
+        Retrieve a key, completed or still running.
+
+        Parameters:
+            key (str): The scoped idempotency key.
+
+        Returns:
+            IdempotencyKey | None: The key, if any.
+        """
+
+        return (await self.db.execute(select(IdempotencyKey).where(IdempotencyKey.key == key))).scalar_one_or_none()
+
+    async def claim_key(self, key: str, request_hash: str, expired_before: datetime,
+                        abandoned_before: datetime) -> None:
+        """
+        Insert a key without a response and commit, replacing the row of the
+        key if it expired or was abandoned by a request that never completed.
+
+        Parameters:
+            key (str): The scoped idempotency key.
+            request_hash (str): SHA-256 of the request payload.
+            expired_before (datetime): Rows claimed before this have expired.
+            abandoned_before (datetime): Rows without a response claimed before this are abandoned.
+
+        Raises:
+            IntegrityError: If the key is already claimed.
+        """
+
+        await self.db.execute(_delete_stale_statement(key=key, expired_before=expired_before,
+                                                      abandoned_before=abandoned_before))
+        self.db.add(IdempotencyKey(key=key, request_hash=request_hash, created_at=datetime.utcnow()))
+        await self.db.commit()
+
+    async def complete_key(self, key: str, status_code: int, body: str) -> None:
+        """
+        Store the response of a claimed key and commit.
+
+        Parameters:
+            key (str): The scoped idempotency key.
+            status_code (int): Status code of the response.
+            body (str): JSON body of the response.
+        """
+
+        await self.db.execute(_complete_statement(key=key, status_code=status_code, body=body))
+        await self.db.commit()
+
+    async def release_key(self, key: str) -> None:
+        """
+        Delete a claimed key that has no response and commit, so it can be retried.
+
+        Parameters:
+            key (str): The scoped idempotency key.
+        """
+
+        await self.db.execute(_release_statement(key=key))
+        await self.db.commit()
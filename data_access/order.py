@@ -1,6 +1,23 @@
-from models.order import Order
-from sqlalchemy.orm import Session
-from schemes.order import OrderCreate
+from models.order import Order, OrdersVersion
+from data_access.counters import increment_counters
+from data_access.summary import SummaryAccess
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from schemes.order import Order as OrderScheme, OrderCreate
+
+ORDER_COLUMNS = (Order.order_id, Order.user_username, Order.product_name, Order.order_date,
+                 Order.dead_line, Order.status, Order.total, Order.notes)
+
+def bump_orders_versions(db: Session, usernames) -> None:
+    """
+    Counts one change of the orders of each user, without committing.
+
+    Users are bumped in name order to keep the lock order the same across transactions.
+    """
+    
+    for username in sorted(set(usernames)):
+        increment_counters(db, OrdersVersion, {"user_username": username}, version=1)
 
 class OrderAccess:
     """
@@ -20,33 +37,277 @@ class OrderAccess:
         
         self.db = db
         
-    def create_order(self, new_order: OrderCreate):
+    def add_order(self, new_order: OrderCreate):
         """
-        Creates a new order in the database.
+        Inserts a new order without committing.
+
+        The order is flushed right away, so a second order of the user for the
+        same product fails on the unique constraint before anything else in
+        the transaction runs.
 
         Parameters:
         - `new_order` (OrderCreate): The order details.
 
         Returns:
-        - The created order.
+        - The pending order.
+
+        Raises:
+        - IntegrityError: If the user already has an order for the product.
         """
         
         db_order = Order(**new_order.dict())
         self.db.add(db_order)
+        self.db.flush()
+        bump_orders_versions(self.db, [new_order.user_username])
+        return db_order
+    
+    def commit_order(self, db_order: Order, new_order: OrderCreate):
+        """
+        Adds an order inserted by `add_order` to the sales summaries and commits.
+
+        Parameters:
+        - `db_order` (Order): The pending order.
+        - `new_order` (OrderCreate): The order details.
+
+        Returns:
+        - The created order.
+        """
+        
+        SummaryAccess(db=self.db).record_orders([new_order])
         self.db.commit()
         self.db.refresh(db_order)
         return db_order
     
-    def verify_order_of_user(self, user_username: str, product_name: str):
+    def get_order_with_product(self, order_id: int, user_username: str):
         """
-        Verifies if a user has an active order with a specific product.
+        Retrieves one of a user's orders with its product, in a single joined SELECT.
+
+        Parameters:
+        - `order_id` (int): The order identifier.
+        - `user_username` (str): The username of the user owning the order.
+
+        Returns:
+        - The order with `product` loaded, or None if the user has no such order.
+        """
+        
+        statement = (select(Order)
+                     .options(joinedload(Order.product))
+                     .where(Order.order_id == order_id, Order.user_username == user_username))
+        
+        return self.db.execute(statement).scalars().first()
+
+    def add_orders(self, new_orders: list):
+        """
+        Inserts several orders without committing.
+
+        The orders are flushed together, so an order of the user for a product
+        already ordered fails on the unique constraint before anything else in
+        the transaction runs, and the user's orders version is bumped.
+
+        Parameters:
+        - `new_orders` (List[OrderCreate]): The orders to create.
+
+        Returns:
+        - The pending orders.
+
+        Raises:
+        - IntegrityError: If the user already has an order for one of the products.
+        """
+        
+        db_orders = [Order(**new_order.dict()) for new_order in new_orders]
+        self.db.add_all(db_orders)
+        self.db.flush()
+        bump_orders_versions(self.db, [new_order.user_username for new_order in new_orders])
+        return db_orders
+    
+    def commit_orders(self, db_orders: list):
+        """
+        Adds orders inserted by `add_orders` to the sales summaries and commits.
+
+        The orders are read back while their state is still loaded, so the
+        commit does not cost a refresh per order.
+
+        Parameters:
+        - `db_orders` (List[Order]): The pending orders.
+
+        Returns:
+        - The created orders.
+        """
+        
+        created_orders = [OrderScheme.from_orm(db_order) for db_order in db_orders]
+        SummaryAccess(db=self.db).record_orders(created_orders)
+        self.db.commit()
+        return created_orders
+    
+    def get_ordered_product_names(self, user_username: str, product_names: set):
+        """
+        Finds which of the given products the user already has an order for, in a single query.
 
         Parameters:
         - `user_username` (str): The username of the user.
-        - `product_name` (str): The name of the product.
+        - `product_names` (set): The product names to check.
+
+        Returns:
+        - The subset of `product_names` the user already ordered.
+        """
+        
+        if not product_names:
+            return set()
+        
+        rows = self.db.query(Order.product_name).filter(Order.user_username == user_username,
+                                                        Order.product_name.in_(product_names))
+        return {product_name for (product_name,) in rows}
+    
+    def get_overdue_order_ids(self, order_status: str, now, limit: int):
+        """
+        Finds orders in a status whose dead line has passed, oldest dead line first.
+
+        Served by the (`status`, `dead_line`) index as a bounded range scan, so
+        orders that already moved on are never walked.
+
+        Parameters:
+        - `order_status` (str): The current status of the orders.
+        - `now` (datetime): Orders with a dead line up to this moment are overdue.
+        - `limit` (int): Maximum number of order ids to return.
 
         Returns:
-        - The order if found, otherwise None.
+        - The ids of up to `limit` overdue orders.
         """
         
-        return self.db.query(Order).filter(Order.user_username == user_username, Order.product_name == product_name).first()
+        statement = (select(Order.order_id)
+                     .where(Order.dead_line <= now, Order.status == order_status)
+                     .order_by(Order.dead_line)
+                     .limit(limit))
+        
+        return self.db.execute(statement).scalars().all()
+    
+    def update_status(self, order_ids: list, from_status: str, to_status: str):
+        """
+        Moves orders from one status to another and commits.
+
+        Orders whose status changed in the meantime are left alone, so
+        concurrent runs never apply a transition twice. The orders version of
+        every owner is bumped in the same transaction.
+
+        Parameters:
+        - `order_ids` (list): The orders to update.
+        - `from_status` (str): The status the orders must still be in.
+        - `to_status` (str): The new status.
+
+        Returns:
+        - The number of orders updated.
+        """
+        
+        usernames = self.db.execute(
+            select(Order.user_username).distinct()
+            .where(Order.order_id.in_(order_ids), Order.status == from_status)
+        ).scalars().all()
+        bump_orders_versions(self.db, usernames)
+        
+        result = self.db.execute(
+            update(Order)
+            .where(Order.order_id.in_(order_ids), Order.status == from_status)
+            .values(status=to_status)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+    
+    def iter_orders(self, user_username: str, batch_size: int, after_id: int | None = None):
+        """
+        Streams a user's orders in `order_id` order, one keyset-paginated query per batch.
+
+        Each batch is an `order_id > last ORDER BY order_id LIMIT batch_size`
+        query, so memory stays bounded by the batch whatever the driver's
+        cursor support. The transaction is ended after every batch, so a slow
+        consumer does not hold a connection.
+
+        Parameters:
+        - `user_username` (str): The username of the user.
+        - `batch_size` (int): Number of rows per query.
+        - `after_id` (int | None): Only orders with a higher order_id.
+
+        Yields:
+        - Batches of column mappings.
+        """
+        
+        while True:
+            statement = (select(*ORDER_COLUMNS)
+                         .where(Order.user_username == user_username)
+                         .order_by(Order.order_id)
+                         .limit(batch_size))
+            
+            if after_id is not None:
+                statement = statement.where(Order.order_id > after_id)
+            
+            batch = self.db.execute(statement).mappings().all()
+            self.db.rollback()
+            
+            if not batch:
+                return
+            
+            yield batch
+            
+            if len(batch) < batch_size:
+                return
+            
+            after_id = batch[-1]["order_id"]
+
+class AsyncOrderAccess:
+    """
+    Data access class for handling order-related database operations on an async session.
+
+    Mirrors the order creation of `OrderAccess`: the insert is flushed first so
+    the unique constraint rejects duplicates, and the sales summaries are
+    updated in the same transaction.
+
+    Parameters:
+    - `db` (AsyncSession): The SQLAlchemy async database session.
+    """
+    
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Initializes the AsyncOrderAccess.
+
+        Parameters:
+        - `db` (AsyncSession): The SQLAlchemy async database session.
+        """
+        
+        self.db = db
+        
+    async def add_order(self, new_order: OrderCreate):
+        """
+        Inserts a new order without committing.
+
+        Parameters:
+        - `new_order` (OrderCreate): The order details.
+
+        Returns:
+        - The pending order.
+
+        Raises:
+        - IntegrityError: If the user already has an order for the product.
+        """
+        
+        db_order = Order(**new_order.dict())
+        self.db.add(db_order)
+        await self.db.flush()
+        await self.db.run_sync(bump_orders_versions, [new_order.user_username])
+        return db_order
+    
+    async def commit_order(self, db_order: Order, new_order: OrderCreate):
+        """
+        Adds an order inserted by `add_order` to the sales summaries and commits.
+
+        Parameters:
+        - `db_order` (Order): The pending order.
+        - `new_order` (OrderCreate): The order details.
+
+        Returns:
+        - The created order.
+        """
+        
+        await self.db.run_sync(lambda session: SummaryAccess(db=session).record_orders([new_order]))
+        await self.db.commit()
+        await self.db.refresh(db_order)
+        return db_order
@@ -1,6 +1,84 @@
-from models.product import Product
+import random
+from os import getenv
+
+from dotenv import load_dotenv
+from models.product import CatalogVersion, Product
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from schemes.product import ProductCreate
+from data_access.counters import increment_counters
+from schemes.product import ProductCreate, ProductFilter, ProductSortField, SortOrder
+
+load_dotenv()
+
+CATALOG_VERSION_SHARDS = int(getenv("CATALOG_VERSION_SHARDS", "8"))
+
+def bump_catalog_version(db: Session) -> None:
+    """
+    Counts one change of the product catalog in a random shard, without committing.
+    """
+    
+    increment_counters(db, CatalogVersion, {"shard": random.randrange(CATALOG_VERSION_SHARDS)}, version=1)
+
+def _reserve_stock_statement(product_ids: list):
+    """
+    Builds the conditional UPDATE shared by ProductAccess and AsyncProductAccess to take one unit of stock.
+    """
+    
+    return (update(Product)
+            .where(Product.product_id.in_(product_ids), Product.stock > 0)
+            .values(stock=Product.stock - 1)
+            .execution_options(synchronize_session=False))
+
+PRODUCT_COLUMNS = (Product.product_id, Product.name, Product.description, Product.price,
+                   Product.stock, Product.created_date)
+
+def _products_page_statement(filters: ProductFilter, sort_by: ProductSortField, order: SortOrder,
+                             limit: int, after: tuple | None = None):
+    """
+    Builds the keyset-paginated SELECT shared by ProductAccess and AsyncProductAccess.
+
+    Only the listed columns are selected, so rows come back as plain mappings
+    without building ORM objects.
+    """
+    
+    statement = select(*PRODUCT_COLUMNS)
+    
+    if filters.min_price is not None:
+        statement = statement.where(Product.price >= filters.min_price)
+    if filters.max_price is not None:
+        statement = statement.where(Product.price <= filters.max_price)
+    if filters.min_stock is not None:
+        statement = statement.where(Product.stock >= filters.min_stock)
+    if filters.max_stock is not None:
+        statement = statement.where(Product.stock <= filters.max_stock)
+    if filters.created_from is not None:
+        statement = statement.where(Product.created_date >= filters.created_from)
+    if filters.created_to is not None:
+        statement = statement.where(Product.created_date <= filters.created_to)
+    
+    sort_column = getattr(Product, sort_by.value)
+    descending = order == SortOrder.desc
+    
+    if after is not None:
+        last_value, last_id = after
+        if sort_by == ProductSortField.product_id:
+            statement = statement.where(Product.product_id < last_id if descending else Product.product_id > last_id)
+        elif descending:
+            statement = statement.where(or_(sort_column < last_value,
+                                            and_(sort_column == last_value, Product.product_id < last_id)))
+        else:
+            statement = statement.where(or_(sort_column > last_value,
+                                            and_(sort_column == last_value, Product.product_id > last_id)))
+    
+    if sort_by == ProductSortField.product_id:
+        order_by = [Product.product_id.desc() if descending else Product.product_id.asc()]
+    elif descending:
+        order_by = [sort_column.desc(), Product.product_id.desc()]
+    else:
+        order_by = [sort_column.asc(), Product.product_id.asc()]
+    
+    return statement.order_by(*order_by).limit(limit)
 
 class ProductAccess:
     """
@@ -20,19 +98,74 @@ class ProductAccess:
         
         self.db = db
         
-    def get_products(self):
+    def get_products(self, filters: ProductFilter, sort_by: ProductSortField, order: SortOrder,
+                     limit: int, after: tuple | None = None):
         """
-        Retrieve all products from the database.
+        Retrieve one page of products using keyset pagination.
+
+        Rows are ordered by the sort column and then by `product_id`, so the page
+        after a given row is found with an index range scan instead of an OFFSET.
+
+        Parameters:
+            filters (ProductFilter): Server-side filters on price, stock and creation date.
+            sort_by (ProductSortField): Column used to sort the products.
+            order (SortOrder): Sort direction.
+            limit (int): Maximum number of products to return.
+            after (tuple | None): `(sort value, product_id)` of the last product of the previous page.
 
         Returns:
-            List[Product]: A list of Product objects representing all products in the database.
+            List[dict]: Up to `limit` products following `after`, as column dicts.
+        """
+        
+        statement = _products_page_statement(filters=filters, sort_by=sort_by, order=order, limit=limit, after=after)
+        
+        return [dict(row) for row in self.db.execute(statement).mappings()]
+
+    def iter_products(self, batch_size: int, after_id: int | None = None):
+        """
+        Stream products in `product_id` order, one keyset-paginated query per batch.
+
+        Each batch is a `product_id > last ORDER BY product_id LIMIT batch_size`
+        range scan on the primary key, so memory stays bounded by the batch
+        whatever the driver's cursor support. The transaction is ended after
+        every batch, so a slow consumer does not hold a connection.
+
+        Parameters:
+            batch_size (int): Number of rows per query.
+            after_id (int | None): Only products with a higher product_id.
+
+        Yields:
+            list: Batches of column mappings.
+        """
+        
+        while True:
+            statement = select(*PRODUCT_COLUMNS).order_by(Product.product_id).limit(batch_size)
+            
+            if after_id is not None:
+                statement = statement.where(Product.product_id > after_id)
+            
+            batch = self.db.execute(statement).mappings().all()
+            self.db.rollback()
+            
+            if not batch:
+                return
+            
+            yield batch
+            
+            if len(batch) < batch_size:
+                return
+            
+            after_id = batch[-1]["product_id"]
 
-        Note:
-            This method executes a query to fetch all products from the database.
-            Make sure the database session (`self.db`) is properly configured and committed.
+    def get_catalog_version(self):
+        """
+        Retrieve the change counter of the catalog, summed over its few shards.
+
+        Returns:
+            int: The number of product changes counted so far.
         """
         
-        return self.db.query(Product).all()
+        return self.db.execute(select(func.coalesce(func.sum(CatalogVersion.version), 0))).scalar_one()
 
     def create_product(self, new_product: ProductCreate):
         """
@@ -47,6 +180,7 @@ class ProductAccess:
         
         db_product = Product(**new_product.dict())
         self.db.add(db_product)
+        bump_catalog_version(self.db)
         self.db.commit()
         self.db.refresh(db_product)
         return db_product
@@ -63,3 +197,204 @@ class ProductAccess:
         """
         
         return self.db.query(Product).filter(Product.name == name).first()
+
+    def get_products_by_names(self, names: set):
+        """
+        Retrieve the products with any of the given names, in a single query.
+
+        Parameters:
+            names (set): The product names to look up.
+
+        Returns:
+            List[Product]: The products found.
+        """
+        
+        if not names:
+            return []
+        
+        return self.db.query(Product).filter(Product.name.in_(names)).all()
+
+    def reserve_stock(self, product_ids: list):
+        """
+        Take one unit of stock from each product with a single conditional UPDATE.
+
+        Only products with `stock > 0` are decremented, so concurrent buyers can
+        never drive the stock below zero. The change, and the catalog version
+        bump that goes with it, is not committed; it belongs to the caller's
+        transaction.
+
+        Parameters:
+            product_ids (list): The ids of the products to reserve, each at most once.
+
+        Returns:
+            int: The number of products that were reserved.
+        """
+        
+        if not product_ids:
+            return 0
+        
+        result = self.db.execute(_reserve_stock_statement(product_ids=product_ids))
+        if result.rowcount:
+            bump_catalog_version(self.db)
+        return result.rowcount
+
+    def lock_stock(self, product_ids: list):
+        """
+        Read the stock of products with SELECT ... FOR UPDATE, locking their rows until the transaction ends.
+
+        Parameters:
+            product_ids (list): The ids of the products to lock.
+
+        Returns:
+            dict: The stock of each product found, by product id.
+        """
+        
+        if not product_ids:
+            return {}
+        
+        statement = (select(Product.product_id, Product.stock)
+                     .where(Product.product_id.in_(product_ids))
+                     .with_for_update())
+        
+        return {row.product_id: row.stock for row in self.db.execute(statement)}
+
+    def get_catalog(self, limit: int):
+        """
+        Retrieve the columns needed on the order path for the most recent products.
+
+        Parameters:
+            limit (int): Maximum number of products to return.
+
+        Returns:
+            list: Rows with product_id, name, price and stock.
+        """
+        
+        return (self.db.query(Product.product_id, Product.name, Product.price, Product.stock)
+                .order_by(Product.product_id.desc())
+                .limit(limit)
+                .all())
+
+    def get_existing_names(self, names: set):
+        """
+        Retrieve which of the given product names already exist, in a single query.
+
+        Parameters:
+            names (set): The product names to look up.
+
+        Returns:
+            set: The subset of `names` already stored in the database.
+        """
+        
+        if not names:
+            return set()
+        
+        return {name for (name,) in self.db.query(Product.name).filter(Product.name.in_(names))}
+
+    def bulk_create_products(self, new_products: list):
+        """
+        Insert many products with a single executemany statement and commit.
+
+        Parameters:
+            new_products (List[ProductCreate]): The products to insert.
+        """
+        
+        if not new_products:
+            return
+        
+        self.db.execute(insert(Product), [product.dict() for product in new_products])
+        bump_catalog_version(self.db)
+        self.db.commit()
+
+class AsyncProductAccess:
+    """
+    Class to handle product-related database operations on an async session.
+
+    Attributes:
+        db (AsyncSession): The SQLAlchemy async database session.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Initialize AsyncProductAccess with an async database session.
+
+        Parameters:
+            db (AsyncSession): The SQLAlchemy async database session.
+        """
+        
+        self.db = db
+        
+    async def get_products(self, filters: ProductFilter, sort_by: ProductSortField, order: SortOrder,
+                           limit: int, after: tuple | None = None):
+        """
+        Retrieve one page of products using keyset pagination.
+
+        Parameters:
+            filters (ProductFilter): Server-side filters on price, stock and creation date.
+            sort_by (ProductSortField): Column used to sort the products.
+            order (SortOrder): Sort direction.
+            limit (int): Maximum number of products to return.
+            after (tuple | None): `(sort value, product_id)` of the last product of the previous page.
+
+        Returns:
+            List[dict]: Up to `limit` products following `after`, as column dicts.
+        """
+        
+        statement = _products_page_statement(filters=filters, sort_by=sort_by, order=order, limit=limit, after=after)
+        
+        result = await self.db.execute(statement)
+        return [dict(row) for row in result.mappings()]
+
+    async def create_product(self, new_product: ProductCreate):
+        """
+        Create a new product in the database.
+
+        Parameters:
+            new_product (ProductCreate): Pydantic model representing the product to be created.
+
+        Returns:
+            Product: The created product.
+        """
+        
+        db_product = Product(**new_product.dict())
+        self.db.add(db_product)
+        await self.db.run_sync(bump_catalog_version)
+        await self.db.commit()
+        await self.db.refresh(db_product)
+        return db_product
+
+    async def get_product_by_name(self, name: str):
+        """
+        Retrieve a product from the database by name.
+
+        Parameters:
+            name (str): The name of the product to retrieve.
+
+        Returns:
+            Product: The product with the specified name.
+        """
+        
+        result = await self.db.execute(select(Product).where(Product.name == name).limit(1))
+        return result.scalars().first()
+
+    async def reserve_stock(self, product_ids: list):
+        """
+        Take one unit of stock from each product with a single conditional UPDATE.
+
+        Same semantics as `ProductAccess.reserve_stock`: nothing is committed,
+        the change and its catalog version bump belong to the caller's
+        transaction.
+
+        Parameters:
+            product_ids (list): The ids of the products to reserve, each at most once.
+
+        Returns:
+            int: The number of products that were reserved.
+        """
+        
+        if not product_ids:
+            return 0
+        
+        result = await self.db.execute(_reserve_stock_statement(product_ids=product_ids))
+        if result.rowcount:
+            await self.db.run_sync(bump_catalog_version)
+        return result.rowcount
@@ -0,0 +1,203 @@
+import random
+from datetime import date
+from decimal import Decimal
+from os import getenv
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from data_access.counters import increment_counters
+from models.order import Order
+from models.summary import DailyRevenue, ProductSales
+
+load_dotenv()
+
+DAILY_REVENUE_SHARDS = int(getenv("DAILY_REVENUE_SHARDS", "8"))
+
+def _as_date(value) -> date:
+    """
+    Normalizes the result of `func.date`, which SQLite returns as text.
+    """
+
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+def _money(value) -> Decimal:
+    """
+    Rounds a revenue read from the database to cents, so sums compare equal across dialects.
+    """
+
+    return Decimal(str(value or 0)).quantize(Decimal("0.01"))
+
+class SummaryAccess:
+    """
+    Data access class for the sales summary tables.
+
+    The summaries are only written through this class: incrementally by order
+    creation, inside the caller's transaction, and from scratch by `rebuild`.
+
+    Parameters:
+    - `db` (Session): The SQLAlchemy database session.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initializes the SummaryAccess.
+
+        Parameters:
+        - `db` (Session): The SQLAlchemy database session.
+        """
+
+        self.db = db
+
+    def record_orders(self, orders: list) -> None:
+        """
+        Adds new orders to the summaries, without committing.
+
+        Orders are aggregated per product and per day first, so a checkout
+        touches each summary row once. Rows are updated in key order to keep
+        the lock order the same across transactions.
+
+        Parameters:
+        - `orders` (list): Objects with product_name, order_date and total attributes.
+        """
+
+        per_product = {}
+        per_day = {}
+
+        for order in orders:
+            total = Decimal(str(order.total))
+            count, revenue = per_product.get(order.product_name, (0, Decimal(0)))
+            per_product[order.product_name] = (count + 1, revenue + total)
+            day = order.order_date.date()
+            count, revenue = per_day.get(day, (0, Decimal(0)))
+            per_day[day] = (count + 1, revenue + total)
+
+        for product_name, (count, revenue) in sorted(per_product.items()):
+            increment_counters(self.db, ProductSales, {"product_name": product_name}, orders_count=count, revenue=revenue)
+
+        for day, (count, revenue) in sorted(per_day.items()):
+            shard = random.randrange(DAILY_REVENUE_SHARDS)
+            increment_counters(self.db, DailyRevenue, {"day": day, "shard": shard}, orders_count=count, revenue=revenue)
+
+    def get_product_sales(self, limit: int):
+        """
+        Retrieves the best selling products by revenue.
+
+        Parameters:
+        - `limit` (int): Maximum number of products to return.
+
+        Returns:
+        - Rows with product_name, orders_count and revenue, highest revenue first.
+        """
+
+        statement = (select(ProductSales.product_name, ProductSales.orders_count, ProductSales.revenue)
+                     .order_by(ProductSales.revenue.desc(), ProductSales.product_name)
+                     .limit(limit))
+
+        return [dict(row) for row in self.db.execute(statement).mappings()]
+
+    def get_daily_revenue(self, date_from: date, date_to: date):
+        """
+        Retrieves the revenue of every day with orders in a date range.
+
+        Parameters:
+        - `date_from` (date): First day of the range.
+        - `date_to` (date): Last day of the range.
+
+        Returns:
+        - Rows with day, orders_count and revenue, oldest day first.
+        """
+
+        statement = (select(DailyRevenue.day,
+                            func.sum(DailyRevenue.orders_count).label("orders_count"),
+                            func.sum(DailyRevenue.revenue).label("revenue"))
+                     .where(DailyRevenue.day >= date_from, DailyRevenue.day <= date_to)
+                     .group_by(DailyRevenue.day)
+                     .order_by(DailyRevenue.day))
+
+        return [dict(row) for row in self.db.execute(statement).mappings()]
+
+    def _computed(self):
+        """
+        Recomputes both summaries from the orders table with GROUP BY queries.
+        """
+
+        per_product = {
+            row.product_name: (row.orders_count, _money(row.revenue))
+            for row in self.db.execute(
+                select(Order.product_name, func.count().label("orders_count"), func.sum(Order.total).label("revenue"))
+                .group_by(Order.product_name)
+            )
+        }
+
+        order_day = func.date(Order.order_date)
+        per_day = {
+            _as_date(row.day): (row.orders_count, _money(row.revenue))
+            for row in self.db.execute(
+                select(order_day.label("day"), func.count().label("orders_count"), func.sum(Order.total).label("revenue"))
+                .group_by(order_day)
+            )
+        }
+
+        return per_product, per_day
+
+    def _stored(self):
+        """
+        Reads both summaries as stored, with the daily shards summed.
+        """
+
+        per_product = {
+            row.product_name: (row.orders_count, _money(row.revenue))
+            for row in self.db.execute(select(ProductSales.product_name, ProductSales.orders_count, ProductSales.revenue))
+        }
+
+        per_day = {
+            _as_date(row.day): (row.orders_count, _money(row.revenue))
+            for row in self.db.execute(
+                select(DailyRevenue.day,
+                       func.sum(DailyRevenue.orders_count).label("orders_count"),
+                       func.sum(DailyRevenue.revenue).label("revenue"))
+                .group_by(DailyRevenue.day)
+            )
+        }
+
+        return per_product, per_day
+
+    def rebuild(self) -> dict:
+        """
+        Recomputes the summaries from the orders table and replaces them, in one transaction.
+
+        Orders created while the rebuild runs may be lost from the summaries,
+        so run it when order traffic is low.
+
+        Returns:
+        - Number of products and days whose stored summary differed from the recomputed one.
+        """
+
+        computed_products, computed_days = self._computed()
+        stored_products, stored_days = self._stored()
+
+        drift = {
+            "products": sum(1 for key in computed_products.keys() | stored_products.keys()
+                            if computed_products.get(key) != stored_products.get(key)),
+            "days": sum(1 for key in computed_days.keys() | stored_days.keys()
+                        if computed_days.get(key) != stored_days.get(key)),
+        }
+
+        self.db.execute(delete(ProductSales))
+        self.db.execute(delete(DailyRevenue))
+
+        if computed_products:
+            self.db.execute(insert(ProductSales), [
+                {"product_name": name, "orders_count": count, "revenue": revenue}
+                for name, (count, revenue) in computed_products.items()
+            ])
+        if computed_days:
+            self.db.execute(insert(DailyRevenue), [
+                {"day": day, "shard": 0, "orders_count": count, "revenue": revenue}
+                for day, (count, revenue) in computed_days.items()
+            ])
+
+        self.db.commit()
+
+        return drift
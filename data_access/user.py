@@ -1,9 +1,40 @@
 from pydantic import EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager
 from models.user import User
-from models.order import Order
+from models.order import Order, OrdersVersion
+from data_access.order import ORDER_COLUMNS
+from schemes.order import OrderFilter
 from schemes.user import UserCreate
 
+def _orders_page_statement(user_username: str, filters: OrderFilter, limit: int, after: tuple | None = None,
+                           entities: tuple = ORDER_COLUMNS):
+    """
+    Builds the keyset-paginated SELECT of a user's orders, newest first.
+
+    Shared by UserAccess and AsyncUserAccess; served by the
+    (`user_username`, `order_date`) index as a bounded range scan. By default
+    only the listed columns are selected, so rows come back as plain mappings;
+    pass `entities=(Order,)` to select ORM objects instead.
+    """
+    
+    statement = select(*entities).where(Order.user_username == user_username)
+    
+    if filters.status is not None:
+        statement = statement.where(Order.status == filters.status)
+    if filters.date_from is not None:
+        statement = statement.where(Order.order_date >= filters.date_from)
+    if filters.date_to is not None:
+        statement = statement.where(Order.order_date <= filters.date_to)
+    
+    if after is not None:
+        last_date, last_id = after
+        statement = statement.where(or_(Order.order_date < last_date,
+                                        and_(Order.order_date == last_date, Order.order_id < last_id)))
+    
+    return statement.order_by(Order.order_date.desc(), Order.order_id.desc()).limit(limit)
+
 class UserAccess:
     """
     Class to handle user-related database operations.
@@ -65,15 +96,159 @@ class UserAccess:
         
         return self.db.query(User).filter(User.email == email.lower()).first()
     
-    async def get_orders(self, user_username: str):
+    def get_orders(self, user_username: str, filters: OrderFilter, limit: int, after: tuple | None = None):
+        """
+        Retrieves one page of a user's orders, newest first.
+
+        Parameters:
+            - `user_username` (str): The username of the user.
+            - `filters` (OrderFilter): Filters on status and order date.
+            - `limit` (int): Maximum number of orders to return.
+            - `after` (tuple | None): `(order_date, order_id)` of the last order of the previous page.
+
+        Returns:
+            - Up to `limit` orders following `after`, as column dicts.
+        """
+        
+        statement = _orders_page_statement(user_username=user_username, filters=filters, limit=limit, after=after)
+        
+        return [dict(row) for row in self.db.execute(statement).mappings()]
+
+class AsyncUserAccess:
+    """
+    Class to handle user-related database operations on an async session.
+
+    Attributes:
+        db (AsyncSession): The SQLAlchemy async database session.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize AsyncUserAccess with an async database session.
+
+        Parameters:
+            db (AsyncSession): The SQLAlchemy async database session.
+        """
+        
+        self.db = db
+
+    async def create_user(self, user: UserCreate):
+        """
+        Create a new user in the database.
+
+        Parameters:
+            user (UserCreate): Pydantic model representing the user to be created.
+
+        Returns:
+            User: The created user.
+        """
+        
+        db_user = User(**user.dict())
+        self.db.add(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
+        return db_user
+
+    async def get_user_by_username(self, username: str):
+        """
+        Retrieve a user from the database by username.
+
+        Parameters:
+            username (str): The username of the user to retrieve.
+
+        Returns:
+            User: The user with the specified username.
+        """
+        
+        result = await self.db.execute(select(User).where(User.username == username).limit(1))
+        return result.scalars().first()
+
+    async def update_password(self, user: User, password: str):
+        """
+        Replace the stored password hash of a user.
+
+        Parameters:
+            user (User): The user to update.
+            password (str): The new password hash.
+
+        Returns:
+            User: The updated user.
+        """
+        
+        user.password = password
+        await self.db.commit()
+        return user
+
+    async def get_user_by_email(self, email: EmailStr):
+        """
+        Retrieve a user from the database by email.
+
+        Parameters:
+            email (EmailStr): The email address of the user to retrieve.
+
+        Returns:
+            User: The user with the specified email address.
+        """
+        
+        result = await self.db.execute(select(User).where(User.email == email.lower()).limit(1))
+        return result.scalars().first()
+    
+    async def get_orders(self, user_username: str, filters: OrderFilter, limit: int, after: tuple | None = None):
+        """
+        Retrieves one page of a user's orders, newest first.
+
+        Parameters:
+            - `user_username` (str): The username of the user.
+            - `filters` (OrderFilter): Filters on status and order date.
+            - `limit` (int): Maximum number of orders to return.
+            - `after` (tuple | None): `(order_date, order_id)` of the last order of the previous page.
+
+        Returns:
+            - Up to `limit` orders following `after`, as column dicts.
+        """
+        
+        statement = _orders_page_statement(user_username=user_username, filters=filters, limit=limit, after=after)
+        
+        result = await self.db.execute(statement)
+        return [dict(row) for row in result.mappings()]
+    
+    async def get_orders_with_products(self, user_username: str, filters: OrderFilter, limit: int,
+                                       after: tuple | None = None):
+        """
+        Retrieves one page of a user's orders with their products, newest first.
+
+        The products are joined into the same SELECT and populate `Order.product`
+        through `contains_eager`, so the page costs one statement whatever its size.
+
+        Parameters:
+            - `user_username` (str): The username of the user.
+            - `filters` (OrderFilter): Filters on status and order date.
+            - `limit` (int): Maximum number of orders to return.
+            - `after` (tuple | None): `(order_date, order_id)` of the last order of the previous page.
+
+        Returns:
+            - Up to `limit` orders following `after`, with `product` loaded.
+        """
+        
+        statement = _orders_page_statement(user_username=user_username, filters=filters, limit=limit, after=after,
+                                           entities=(Order,))
+        statement = statement.join(Order.product).options(contains_eager(Order.product))
+        
+        result = await self.db.execute(statement)
+        return result.scalars().all()
+    
+    async def get_orders_version(self, user_username: str):
         """
-        Retrieves all orders associated with a user.
+        Retrieves the change counter of the user's orders, a single primary key lookup.
 
         Parameters:
             - `user_username` (str): The username of the user.
 
         Returns:
-            - A list of orders associated with the user.
+            - The number of order inserts and status changes counted for the user, 0 if none.
         """
         
-        return self.db.query(Order).filter(Order.user_username == user_username).all()
\ No newline at end of file
+        result = await self.db.execute(
+            select(OrdersVersion.version).where(OrdersVersion.user_username == user_username)
+        )
+        return result.scalar() or 0
@@ -1,8 +1,50 @@
-from .config import SessionLocal
+from fastapi import Request
 
-def get_db():
+from .config import AsyncReplicaSessionLocals, AsyncSessionLocal, ReplicaSessionLocals, SessionLocal
+from .routing import ReadRouter, sticky_key
+
+read_router = ReadRouter(primary=SessionLocal, replicas=ReplicaSessionLocals)
+
+async_read_router = ReadRouter(primary=AsyncSessionLocal, replicas=AsyncReplicaSessionLocals)
+
+def get_db(request: Request):
+    """
+    Session on the primary database, for routes that write.
+
+    Commits that wrote make the user's next reads go to the primary too.
+    """
+    
     db = SessionLocal()
+    db.info["sticky_key"] = sticky_key(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db(request: Request):
+    """
+    Async session on the primary database, for routes that write.
+    """
+    
+    async with AsyncSessionLocal() as db:
+        db.info["sticky_key"] = sticky_key(request)
+        yield db
+
+def get_reader_db(request: Request):
+    """
+    Session for read-only routes, on a replica unless the user wrote recently.
+    """
+    
+    db = read_router.session_factory(sticky_key(request))()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_reader_db(request: Request):
+    """
+    Async session for read-only routes, on a replica unless the user wrote recently.
+    """
+    
+    async with async_read_router.session_factory(sticky_key(request))() as db:
+        yield db
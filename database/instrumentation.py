@@ -0,0 +1,144 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+_request_stats: ContextVar = ContextVar("request_query_stats", default=None)
+
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain-slow-query")
+
+class QueryStats:
+    """
+    Statements executed on behalf of one request.
+
+    The object is stored in a context variable when the request starts, so the
+    engine listeners reach it from the event loop and from worker threads alike.
+
+    Attributes:
+        count (int): Number of statements executed.
+        total_time (float): Accumulated statement time, in seconds.
+        slowest_time (float): Duration of the slowest statement, in seconds.
+        slowest_statement (str | None): SQL of the slowest statement.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the counters at zero.
+        """
+
+        self._lock = Lock()
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, duration: float) -> None:
+        """
+        Records one executed statement.
+
+        Parameters:
+        - `statement` (str): The SQL sent to the database.
+        - `duration` (float): Seconds the statement took.
+        """
+
+        with self._lock:
+            self.count += 1
+            self.total_time += duration
+            if duration > self.slowest_time:
+                self.slowest_time = duration
+                self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """
+        Returns the figures as a `Server-Timing` header value, durations in milliseconds.
+        """
+
+        return (f'db;dur={self.total_time * 1000:.2f};desc="{self.count} queries", '
+                f'db-slowest;dur={self.slowest_time * 1000:.2f}')
+
+def start_request_stats() -> QueryStats:
+    """
+    Starts collecting statements for the current request.
+
+    Returns:
+    - The stats object the engine listeners will fill.
+    """
+
+    stats = QueryStats()
+    _request_stats.set(stats)
+    return stats
+
+def _describe_parameters(parameters, executemany: bool) -> str:
+    """
+    Summarizes bound parameters by count and type, so their values, which may be
+    password hashes, emails or stored responses, never reach the logs.
+    """
+
+    if executemany:
+        rows = list(parameters or ())
+        width = len(rows[0]) if rows else 0
+        return f"{len(rows)} rows of {width} parameters"
+
+    values = list(parameters.values()) if isinstance(parameters, dict) else list(parameters or ())
+    return f"{len(values)} parameters ({', '.join(type(value).__name__ for value in values)})"
+
+def _explain(explain_engine, statement: str, parameters) -> None:
+    """
+    Logs the plan of a slow SELECT, using a fresh connection of `explain_engine`.
+    """
+
+    prefix = "EXPLAIN QUERY PLAN " if explain_engine.dialect.name == "sqlite" else "EXPLAIN "
+
+    try:
+        with explain_engine.connect() as connection:
+            plan = connection.exec_driver_sql(prefix + statement, parameters).fetchall()
+    except SQLAlchemyError:
+        logger.warning("Could not explain slow query", exc_info=True)
+        return
+
+    logger.warning("Slow query plan:\n%s", "\n".join(str(tuple(row)) for row in plan))
+
+def instrument_engine(engine, slow_query_threshold: float, explain_engine=None) -> None:
+    """
+    Attaches the statement timing listeners to an engine.
+
+    Every statement is added to the current request's `QueryStats`, if any.
+    Statements slower than `slow_query_threshold` are logged, with the count
+    and types of their parameters but never their values, and, for SELECTs,
+    their plan is fetched in the background on a separate connection so the
+    request is never delayed by the EXPLAIN.
+
+    Parameters:
+    - `engine`: The engine to instrument (`AsyncEngine.sync_engine` for async engines).
+    - `slow_query_threshold` (float): Seconds above which a statement is logged; 0 disables the log.
+    - `explain_engine`: Sync engine used to run EXPLAIN. Defaults to `engine`.
+    """
+
+    explain_engine = explain_engine or engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = perf_counter() - conn.info["query_start_time"].pop()
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.record(statement=statement, duration=duration)
+
+        if slow_query_threshold and duration >= slow_query_threshold:
+            keyword = statement.lstrip()[:7].upper()
+            if keyword == "EXPLAIN":
+                return
+            logger.warning("Slow query (%.2f ms): %s | %s", duration * 1000, statement,
+                           _describe_parameters(parameters, executemany))
+            if not executemany and keyword.startswith("SELECT"):
+                _explain_executor.submit(_explain, explain_engine, statement, parameters)
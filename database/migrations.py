@@ -0,0 +1,129 @@
+from sqlalchemy import MetaData, UniqueConstraint, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex, DropIndex
+
+class SchemaMigrationError(Exception):
+    """
+    Raised when the database cannot be brought in line with the models without losing data.
+    """
+
+def _count_duplicates(connection: Connection, table, columns: list) -> int:
+    """
+    Counts the groups of rows sharing the same values in `columns`.
+    """
+
+    grouped = (select(*(table.c[column] for column in columns))
+               .group_by(*(table.c[column] for column in columns))
+               .having(func.count() > 1)
+               .subquery())
+
+    return connection.execute(select(func.count()).select_from(grouped)).scalar_one()
+
+def _check_unique(connection: Connection, table, name: str, columns: list) -> None:
+    """
+    Raises if the rows of `table` already break the uniqueness about to be enforced.
+    """
+
+    duplicates = _count_duplicates(connection, table, columns)
+
+    if duplicates:
+        raise SchemaMigrationError(
+            f"Cannot enforce {name}: {table.name} holds {duplicates} duplicated ({', '.join(columns)}) "
+            "values; remove the duplicates and run the migration again"
+        )
+
+def _make_index_unique(connection: Connection, index) -> None:
+    """
+    Replaces an existing non-unique index by its unique version.
+
+    MySQL swaps both in one ALTER TABLE, since a foreign key may need the
+    index at every moment; other dialects drop and recreate it in the
+    migration transaction.
+    """
+
+    if connection.dialect.name == "mysql":
+        preparer = connection.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(column.name) for column in index.columns)
+        connection.execute(text(
+            f"ALTER TABLE {preparer.format_table(index.table)} DROP INDEX {preparer.quote(index.name)}, "
+            f"ADD UNIQUE INDEX {preparer.quote(index.name)} ({columns})"
+        ))
+        return
+
+    connection.execute(DropIndex(index))
+    connection.execute(CreateIndex(index))
+
+def _add_unique_constraint(connection: Connection, constraint: UniqueConstraint) -> None:
+    """
+    Enforces a unique constraint missing from an existing table through a unique index of the same name.
+
+    Every supported dialect enforces a unique index like the constraint, and
+    SQLite cannot add a constraint to an existing table.
+    """
+
+    preparer = connection.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(column.name) for column in constraint.columns)
+    connection.execute(text(
+        f"CREATE UNIQUE INDEX {preparer.quote(constraint.name)} ON {preparer.format_table(constraint.table)} ({columns})"
+    ))
+
+def upgrade_schema(engine: Engine, metadata: MetaData) -> list:
+    """
+    Creates the missing tables, then adds the indexes and unique constraints
+    that the models declare but existing tables lack, in one transaction.
+
+    `create_all` alone never alters an existing table, so a database created
+    by an older version would keep accepting rows that the code now expects
+    the database to reject. Before any uniqueness is enforced, the existing
+    rows are checked for duplicates.
+
+    Parameters:
+    - `engine` (Engine): The engine of the database to upgrade.
+    - `metadata` (MetaData): The metadata of the models.
+
+    Returns:
+    - A description of every change applied, empty if the schema was up to date.
+
+    Raises:
+    - SchemaMigrationError: If existing rows break a uniqueness to enforce; no existing table is altered then.
+    """
+
+    metadata.create_all(bind=engine)
+    changes = []
+
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+
+        for table in metadata.sorted_tables:
+            existing_indexes = {index["name"]: index for index in inspector.get_indexes(table.name)}
+            existing_uniques = {constraint["name"] for constraint in inspector.get_unique_constraints(table.name)}
+
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                current = existing_indexes.get(index.name)
+                columns = [column.name for column in index.columns]
+
+                if current is not None and (current["unique"] or not index.unique):
+                    continue
+
+                if index.unique:
+                    _check_unique(connection, table, index.name, columns)
+
+                if current is None:
+                    connection.execute(CreateIndex(index))
+                    changes.append(f"created index {index.name} on {table.name} ({', '.join(columns)})")
+                else:
+                    _make_index_unique(connection, index)
+                    changes.append(f"made index {index.name} on {table.name} ({', '.join(columns)}) unique")
+
+            for constraint in table.constraints:
+                if not isinstance(constraint, UniqueConstraint) or constraint.name is None:
+                    continue
+                if constraint.name in existing_uniques or constraint.name in existing_indexes:
+                    continue
+
+                columns = [column.name for column in constraint.columns]
+                _check_unique(connection, table, constraint.name, columns)
+                _add_unique_constraint(connection, constraint)
+                changes.append(f"added unique constraint {constraint.name} on {table.name} ({', '.join(columns)})")
+
+    return changes
@@ -0,0 +1,119 @@
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class PoolStats:
+    """
+    Counters describing how long checkouts wait on a connection pool.
+
+    Attributes:
+        checkouts (int): Number of successful checkouts.
+        timeouts (int): Number of checkouts that gave up after `pool_timeout`.
+        total_wait (float): Accumulated checkout wait, in seconds.
+        max_wait (float): Longest single checkout wait, in seconds.
+    """
+    
+    def __init__(self) -> None:
+        """
+        Initializes the counters at zero.
+        """
+        
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        """
+        Records one checkout attempt.
+
+        Parameters:
+        - `wait` (float): Seconds spent waiting for the connection.
+        - `timed_out` (bool): Whether the attempt ended in a pool timeout.
+        """
+        
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+                
+    def as_dict(self) -> dict:
+        """
+        Returns a snapshot of the counters.
+        """
+        
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "total_wait_ms": round(self.total_wait * 1000, 3),
+                "avg_wait_ms": round(self.total_wait * 1000 / attempts, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+class InstrumentedPoolMixin:
+    """
+    Times every checkout of a queue pool and counts checkout timeouts.
+    """
+    
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(perf_counter() - start)
+        return connection
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    """
+    QueuePool with checkout wait and timeout statistics.
+    """
+
+class InstrumentedAsyncPool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool with checkout wait and timeout statistics.
+    """
+
+def pool_status(engine) -> dict:
+    """
+    Returns live statistics of the connection pool behind an engine.
+
+    Parameters:
+    - `engine`: A sync `Engine` or an `AsyncEngine`.
+
+    Returns:
+    - Pool class, configured size, connections checked in and out, overflow in use
+      and, for instrumented pools, checkout wait and timeout counters.
+    """
+    
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+        
+    if isinstance(pool, InstrumentedPoolMixin):
+        status.update(pool.stats.as_dict())
+        
+    return status
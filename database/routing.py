@@ -0,0 +1,93 @@
+from itertools import cycle
+from os import getenv
+from threading import Lock
+
+from dotenv import load_dotenv
+from fastapi import Request
+from jose import JWTError, jwt
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from services.cache import TTLCache
+
+load_dotenv()
+
+REPLICA_STICKY_SECONDS = float(getenv("REPLICA_STICKY_SECONDS", "5"))
+REPLICA_STICKY_SIZE = int(getenv("REPLICA_STICKY_SIZE", "10000"))
+
+recent_writers = TTLCache(maxsize=REPLICA_STICKY_SIZE, ttl=REPLICA_STICKY_SECONDS)
+
+class ReadRouter:
+    """
+    Chooses the session factory of each read-only session.
+
+    Reads go round-robin to the replicas, except for users who committed a
+    write in the last `REPLICA_STICKY_SECONDS`: they read from the primary
+    until the replicas had time to catch up. Without replicas every read goes
+    to the primary.
+
+    Attributes:
+        primary: Session factory of the primary database.
+        replicas (list): Session factories of the replicas.
+    """
+
+    def __init__(self, primary, replicas: list) -> None:
+        """
+        Initializes the router.
+
+        Parameters:
+        - `primary`: Session factory of the primary database.
+        - `replicas` (list): Session factories of the replicas.
+        """
+
+        self.primary = primary
+        self.replicas = replicas
+        self._next_replica = cycle(replicas)
+        self._lock = Lock()
+
+    def session_factory(self, sticky_key: str | None):
+        """
+        Returns the session factory to read with for the given user.
+
+        Parameters:
+        - `sticky_key` (str | None): Identifies the user, see `sticky_key`.
+        """
+
+        if not self.replicas or (sticky_key is not None and recent_writers.get(sticky_key)):
+            return self.primary
+
+        with self._lock:
+            return next(self._next_replica)
+
+def sticky_key(request: Request) -> str | None:
+    """
+    Returns the subject of the request's bearer token, used to route a user's
+    reads to the primary right after their own writes.
+
+    The signature is not verified: the key only picks a database, and the
+    route's own authentication still validates the token.
+    """
+
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+@event.listens_for(Session, "after_flush")
+def _remember_write(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(Session, "after_commit")
+def _mark_recent_writer(session):
+    if session.info.pop("wrote", False) and session.info.get("sticky_key") is not None:
+        recent_writers.set(session.info["sticky_key"], True)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
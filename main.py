@@ -1,35 +1,142 @@
-import models
-from fastapi import FastAPI, Depends, HTTPException, status
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from services.readiness import readiness, warm_pools
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from controllers.user import user_router
 from controllers.product import product_router
 from controllers.order import order_router
-from database.config import engine
-from database.get_db import get_db
+from controllers.export import export_router
+from controllers.report import report_router
+from controllers.system import metrics_router, system_router
+from database.config import SessionLocal, async_engine, engine
+from database.instrumentation import start_request_stats
+from database.get_db import get_async_db
+from data_access.product import ProductAccess
 from services.auth import AuthService
+from services.catalog import product_catalog
+from services.metrics import MetricsMiddleware, request_metrics
+from services.rate_limit import client_ip, enforce_limits, login_ip_limiter, login_user_limiter
+from services.scheduler import ORDER_SCHEDULER_ENABLED, order_scheduler
+from services.profiling import (PROFILING_DIR, PROFILING_ENABLED, PROFILING_INTERVAL_MS, PROFILING_KEY,
+                                PROFILING_SAMPLE_RATE, ProfilerMiddleware)
+
+logger = logging.getLogger(__name__)
+
+def warm_product_catalog():
+    """
+    Loads the most recent products into the in-process catalog cache.
+    """
+    
+    db = SessionLocal()
+    
+    try:
+        product_catalog.warm(product_access=ProductAccess(db=db))
+    except SQLAlchemyError:
+        logger.warning("Could not warm the product catalog, it will fill on demand", exc_info=True)
+    finally:
+        db.close()
+
+async def warm_up():
+    """
+    Warms both connection pools, then the product catalog, without blocking startup.
+    """
+    
+    await warm_pools(engine=engine, async_engine=async_engine, readiness=readiness)
+    await run_in_threadpool(warm_product_catalog)
 
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts the background work of the worker and stops it on shutdown.
+
+    The warmup runs in the background, so the worker accepts requests (and
+    answers the readiness probe) even while the database is unreachable. The
+    schema is not created here; run `python manage.py init-db` once instead.
+    """
+    
+    warm_up_task = asyncio.create_task(warm_up())
+    
+    if ORDER_SCHEDULER_ENABLED:
+        order_scheduler.start()
+    
+    readiness.mark_started()
+    
+    try:
+        yield
+    finally:
+        warm_up_task.cancel()
+        await order_scheduler.stop()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
-@app.post("/token")
+@app.middleware("http")
+async def count_queries(request: Request, call_next):
+    """
+    Reports the statements a request ran in the `Server-Timing` and
+    `X-DB-Query-Count` response headers and in one log line per request.
+
+    Streaming responses report what ran before their headers were sent.
+    """
+    
+    stats = start_request_stats()
+    
+    response = await call_next(request)
+    
+    response.headers["X-DB-Query-Count"] = str(stats.count)
+    response.headers["Server-Timing"] = stats.server_timing()
+    
+    logger.info(
+        "request method=%s path=%s status=%d queries=%d db_ms=%.2f slowest_ms=%.2f",
+        request.method, request.url.path, response.status_code, stats.count,
+        stats.total_time * 1000, stats.slowest_time * 1000,
+        extra={"method": request.method, "path": request.url.path, "status_code": response.status_code,
+               "db_queries": stats.count, "db_time_ms": round(stats.total_time * 1000, 3),
+               "db_slowest_ms": round(stats.slowest_time * 1000, 3), "db_slowest_statement": stats.slowest_statement},
+    )
+    
+    return response
+
+app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilerMiddleware, directory=PROFILING_DIR, key=PROFILING_KEY,
+                       sample_rate=PROFILING_SAMPLE_RATE, interval=PROFILING_INTERVAL_MS / 1000)
+
+def limit_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    """
+    Rate limits login attempts per client address and per username, before any
+    user lookup or password verification is done.
+    """
+    
+    enforce_limits((login_ip_limiter, client_ip(request)), (login_user_limiter, form_data.username.lower()))
+
+@app.post("/token", dependencies=[Depends(limit_login)])
 async def login_for_token(form_data: OAuth2PasswordRequestForm = Depends(),
-                          db: Session = Depends(get_db)):
+                          db: AsyncSession = Depends(get_async_db)):
     """
     Endpoint to obtain an access token (login).
 
     Parameters:
     - `form_data`: Form data with the username and password.
-    - `db`: Database session.
+    - `db`: Async database session.
 
     Returns:
     - Access token if the credentials are valid.
+
+    Raises:
+    - HTTPException: 401 if the credentials are wrong, 429 if the client or
+      username made too many attempts.
     """
     
     auth_service = AuthService(db=db)
     
-    user = auth_service.authenticate_user(username=form_data.username, password=form_data.password)
+    user = await auth_service.authenticate_user_async(username=form_data.username, password=form_data.password)
     
     if not user:
         raise HTTPException(
@@ -39,11 +146,15 @@ async def login_for_token(form_data: OAuth2PasswordRequestForm = Depends(),
         )
         
     access_token = auth_service.create_access_token(
-        data={"sub": user.username}
+        data={"sub": user.username, "uid": user.user_id}
     )
     
     return {"access_token": access_token, "token_type": "bearer"}    
 
 app.include_router(user_router)
 app.include_router(product_router)
-app.include_router(order_router)
\ No newline at end of file
+app.include_router(order_router)
+app.include_router(export_router)
+app.include_router(report_router)
+app.include_router(system_router)
+app.include_router(metrics_router)
\ No newline at end of file
@@ -0,0 +1,106 @@
+import argparse
+import csv
+
+import models
+from database.config import SessionLocal, engine
+from database.migrations import SchemaMigrationError, upgrade_schema
+from data_access.summary import SummaryAccess
+from services.idempotency import IdempotencyService
+from services.product import BULK_BATCH_SIZE, ProductService
+
+def import_products(args):
+    """
+    Imports products from a CSV file with the columns name, description, price and stock.
+
+    Uses the same code path as `POST /v1/products/bulk`.
+    """
+    
+    db = SessionLocal()
+    
+    try:
+        with open(args.path, newline="", encoding="utf-8") as csv_file:
+            product_service = ProductService(db=db)
+            result = product_service.bulk_create_products(rows=csv.DictReader(csv_file), batch_size=args.batch_size)
+    finally:
+        db.close()
+    
+    for conflict in result.conflicts:
+        print(f"row {conflict.row} ({conflict.name}): {conflict.detail}")
+    
+    print(f"{result.created} products created, {len(result.conflicts)} rows rejected")
+
+def init_db(args):
+    """
+    Creates the missing tables and upgrades the existing ones.
+
+    Indexes and unique constraints that the models declare but an existing
+    table lacks are added, after checking that no rows already break them.
+    Order and product creation rely on those constraints to reject duplicates.
+    """
+    
+    try:
+        changes = upgrade_schema(engine=engine, metadata=models.Base.metadata)
+    except SchemaMigrationError as error:
+        raise SystemExit(f"Schema upgrade failed: {error}")
+    
+    for change in changes:
+        print(change)
+    
+    print(f"Schema ready: {', '.join(sorted(models.Base.metadata.tables))}")
+
+def rebuild_summaries(args):
+    """
+    Recomputes the sales summary tables from the orders table, reporting the drift found.
+    """
+    
+    db = SessionLocal()
+    
+    try:
+        drift = SummaryAccess(db=db).rebuild()
+    finally:
+        db.close()
+    
+    print(f"Summaries rebuilt: {drift['products']} products and {drift['days']} days had drifted")
+
+def purge_idempotency_keys(args):
+    """
+    Deletes the stored idempotency keys older than `IDEMPOTENCY_TTL`; run it periodically, e.g. from cron.
+    """
+    
+    db = SessionLocal()
+    
+    try:
+        deleted = IdempotencyService(db=db).purge_expired()
+    finally:
+        db.close()
+    
+    print(f"{deleted} expired idempotency keys deleted")
+
+def main():
+    """
+    Entry point of the management commands.
+    """
+    
+    parser = argparse.ArgumentParser(description="API REST management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    init_parser = commands.add_parser("init-db", help="Create or upgrade the database tables")
+    init_parser.set_defaults(handler=init_db)
+    
+    rebuild_parser = commands.add_parser("rebuild-summaries", help="Recompute the sales summaries")
+    rebuild_parser.set_defaults(handler=rebuild_summaries)
+    
+    purge_parser = commands.add_parser("purge-idempotency-keys", help="Delete expired idempotency keys")
+    purge_parser.set_defaults(handler=purge_idempotency_keys)
+    
+    import_parser = commands.add_parser("import-products", help="Import products from a CSV file")
+    import_parser.add_argument("path", help="Path of the CSV file")
+    import_parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE,
+                               help="Rows checked and inserted per batch")
+    import_parser.set_defaults(handler=import_products)
+    
+    args = parser.parse_args()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
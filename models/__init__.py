@@ -1,5 +1,7 @@
 from database.config import Base
-from .product import Product
+from .product import CatalogVersion, Product
 from .admin import Admin
-from .order import Order
-from .user import User
\ No newline at end of file
+from .order import Order, OrdersVersion
+from .user import User
+from .summary import DailyRevenue, ProductSales
+from .idempotency import IdempotencyKey
\ No newline at end of file
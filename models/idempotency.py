@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from database.config import Base
+
+class IdempotencyKey(Base):
+    """
+    Response stored for an `Idempotency-Key`, so a retried request can be replayed after a restart.
+
+    The row is inserted before the request runs, without a response, so it
+    doubles as a lock: another worker receiving the same key fails to insert
+    it and answers 409 until the response is stored.
+
+    Attributes:
+        key (str): The client key, scoped by user and route (primary key).
+        request_hash (str): SHA-256 of the request payload the key was first used with.
+        status_code (int | None): Status code of the stored response, None while the request runs.
+        body (str | None): JSON body of the stored response, None while the request runs.
+        created_at (DateTime): When the key was claimed; older keys expire and are purged.
+    """
+    
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer)
+    body = Column(Text)
+    created_at = Column(DateTime, nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, DECIMAL
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, DECIMAL, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from database.config import Base
 
@@ -16,12 +16,25 @@ class Order(Base):
         total (DECIMAL): The total cost of the order.
         notes (str): Additional notes or comments related to the order.
 
+    Constraints:
+        A user can hold only one order per product (`user_username`, `product_name` unique).
+        The order history of a user is read through the (`user_username`, `order_date`) index.
+        Overdue orders of a status are found through the (`status`, `dead_line`) index.
+
     Relationships:
         user (User): The user associated with the order.
         product (Product): The product associated with the order.
+
+        Relationships are never lazy loaded; queries that need them must load them
+        eagerly (joinedload / selectinload), so an N+1 pattern fails loudly.
     """
     
     __tablename__ = "orders"
+    __table_args__ = (
+        UniqueConstraint("user_username", "product_name", name="uq_orders_user_username_product_name"),
+        Index("ix_orders_user_username_order_date", "user_username", "order_date"),
+        Index("ix_orders_status_dead_line", "status", "dead_line"),
+    )
     
     order_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     user_username = Column(String(50), ForeignKey("users.username"), index=True)
@@ -32,6 +45,24 @@ class Order(Base):
     total = Column(DECIMAL(7,2))
     notes = Column(String(150))
     
-    user = relationship("User", back_populates="orders")
+    user = relationship("User", back_populates="orders", lazy="raise_on_sql")
+    
+    product = relationship("Product", back_populates="orders", lazy="raise_on_sql")
+    
+class OrdersVersion(Base):
+    """
+    Change counter of a user's orders, bumped in the same transaction as every
+    order insert and status change of the user.
+
+    The ETag of the order history is built from it, so a conditional request
+    reads one row instead of aggregating every order of the user.
+
+    Attributes:
+        user_username (str): The user owning the orders (primary key, foreign key).
+        version (int): Number of changes counted for the user.
+    """
+    
+    __tablename__ = "orders_version"
     
-    product = relationship("Product", back_populates="orders")
\ No newline at end of file
+    user_username = Column(String(50), ForeignKey("users.username"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
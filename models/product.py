@@ -8,23 +8,42 @@ class Product(Base):
 
     Attributes:
         product_id (int): The unique identifier for the product (primary key).
-        name (str): The name of the product.
+        name (str): The name of the product (unique).
         description (str): The description of the product.
         price (DECIMAL): The price of the product.
         created_date (DateTime): The date and time when the product was created.
         stock (int): The current stock quantity of the product.
 
     Relationships:
-        orders (List[Order]): List of orders associated with the product.
+        orders (List[Order]): List of orders associated with the product (eager loading only).
     """
     
     __tablename__ = "products"
     
     product_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    name = Column(String(50), index=True)
+    name = Column(String(50), index=True, unique=True)
     description = Column(String(150))
     price = Column(DECIMAL(7,2), index=True)
     created_date = Column(DateTime, index=True)
     stock = Column(Integer, index=True)
     
-    orders = relationship("Order", back_populates="product")
\ No newline at end of file
+    orders = relationship("Order", back_populates="product", lazy="raise_on_sql")
+    
+class CatalogVersion(Base):
+    """
+    Change counter of the product catalog, bumped in the same transaction as
+    every product creation and stock reservation.
+
+    The counter is split over a few shards picked at random by each writer,
+    so concurrent orders rarely wait on the same row lock. Readers sum the
+    shards, a handful of rows, to build the ETag of the product listings.
+
+    Attributes:
+        shard (int): The shard of the counter (primary key).
+        version (int): Number of changes counted in the shard.
+    """
+    
+    __tablename__ = "catalog_version"
+    
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, default=0)
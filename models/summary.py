@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DECIMAL
+from database.config import Base
+
+class ProductSales(Base):
+    """
+    Running sales totals of a product, updated in the same transaction as each order.
+
+    Attributes:
+        product_name (str): The product name (primary key, foreign key).
+        orders_count (int): Number of orders of the product.
+        revenue (DECIMAL): Sum of the totals of those orders.
+    """
+    
+    __tablename__ = "product_sales"
+    
+    product_name = Column(String(50), ForeignKey("products.name"), primary_key=True)
+    orders_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(12,2), nullable=False, default=0, index=True)
+    
+class DailyRevenue(Base):
+    """
+    Running revenue of a day, updated in the same transaction as each order.
+
+    Every day is split over a few shards picked at random by each order, so
+    concurrent orders rarely wait on the same row lock. Readers sum the shards.
+
+    Attributes:
+        day (Date): The day the orders were placed (primary key).
+        shard (int): The shard of the day (primary key).
+        orders_count (int): Number of orders counted in the shard.
+        revenue (DECIMAL): Sum of the totals of those orders.
+    """
+    
+    __tablename__ = "daily_revenue"
+    
+    day = Column(Date, primary_key=True)
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    orders_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(12,2), nullable=False, default=0)
@@ -15,7 +15,7 @@ class User(Base):
         address (str): The address of the user.
 
     Relationships:
-        orders (List[Order]): List of orders associated with the user.
+        orders (List[Order]): List of orders associated with the user (eager loading only).
     """
     
     __tablename__ = "users"
@@ -27,4 +27,4 @@ class User(Base):
     name = Column(String(50))
     address = Column(String(50))
     
-    orders = relationship("Order", back_populates="user")
\ No newline at end of file
+    orders = relationship("Order", back_populates="user", lazy="raise_on_sql")
\ No newline at end of file
@@ -0,0 +1,9 @@
+from enum import Enum
+
+class ExportFormat(str, Enum):
+    """
+    Output formats of the streaming exports.
+    """
+    
+    ndjson = "ndjson"
+    csv = "csv"
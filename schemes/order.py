@@ -1,5 +1,7 @@
 from datetime import datetime
-from pydantic import BaseModel
+from typing import List
+
+from pydantic import BaseModel, conlist
 
 class OrderBase(BaseModel):
     """
@@ -46,4 +48,98 @@ class Order(OrderCreate):
         """
         Pydantic configuration for ORM mode.
         """
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+    
+class CheckoutRequest(BaseModel):
+    """
+    Pydantic model for a checkout of several products at once.
+
+    Attributes:
+        items (List[OrderBase]): One entry per product to order.
+    """
+    
+    items: conlist(OrderBase, min_items=1)
+    
+class CheckoutError(BaseModel):
+    """
+    Pydantic model for an item rejected during checkout.
+
+    Attributes:
+        index (int): 0-based position of the item in the checkout.
+        product_name (str): The product name of the item.
+        detail (str): Why the item was rejected.
+    """
+    
+    index: int
+    product_name: str
+    detail: str
+    
+class OrderFilter(BaseModel):
+    """
+    Pydantic model for the server-side filters of the order history.
+
+    Attributes:
+        status (str | None): Only orders with this status.
+        date_from (datetime | None): Only orders placed at or after this date.
+        date_to (datetime | None): Only orders placed at or before this date.
+    """
+    
+    status: str | None = None
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    
+class OrderPage(BaseModel):
+    """
+    Pydantic model for one page of the order history, newest orders first.
+
+    Attributes:
+        items (List[Order]): The orders of the page.
+        next_cursor (str | None): Cursor of the next page, None on the last page.
+    """
+    
+    items: List[Order]
+    next_cursor: str | None = None
+    
+class OrderProduct(BaseModel):
+    """
+    Pydantic model for the product details embedded in an order.
+
+    Attributes:
+        product_id (int): The unique identifier for the product.
+        name (str): The name of the product.
+        description (str): The description of the product.
+        price (float): The price of the product.
+    """
+    
+    product_id: int
+    name: str
+    description: str
+    price: float
+    
+    class Config:
+        """
+        Pydantic configuration for ORM mode.
+        """
+        orm_mode = True
+        
+class OrderWithProduct(Order):
+    """
+    Pydantic model representing an order with its product embedded.
+
+    Attributes:
+        product (OrderProduct): The ordered product.
+    """
+    
+    product: OrderProduct
+    
+class OrderWithProductPage(BaseModel):
+    """
+    Pydantic model for one page of the detailed order history, newest orders first.
+
+    Attributes:
+        items (List[OrderWithProduct]): The orders of the page with their products.
+        next_cursor (str | None): Cursor of the next page, None on the last page.
+    """
+    
+    items: List[OrderWithProduct]
+    next_cursor: str | None = None
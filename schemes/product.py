@@ -1,4 +1,7 @@
 from datetime import datetime
+from enum import Enum
+from typing import List
+
 from pydantic import BaseModel
 
 class ProductBase(BaseModel):
@@ -42,3 +45,79 @@ class Product(ProductCreate):
         Pydantic configuration for ORM mode.
         """
         orm_mode = True
+    
+class ProductSortField(str, Enum):
+    """
+    Columns the product listing can be sorted by.
+    """
+    
+    product_id = "product_id"
+    price = "price"
+    stock = "stock"
+    created_date = "created_date"
+    
+class SortOrder(str, Enum):
+    """
+    Sort direction for paginated listings.
+    """
+    
+    asc = "asc"
+    desc = "desc"
+    
+class ProductFilter(BaseModel):
+    """
+    Pydantic model for the server-side filters of the product listing.
+
+    Attributes:
+        min_price (float | None): Lowest price to include.
+        max_price (float | None): Highest price to include.
+        min_stock (int | None): Lowest stock quantity to include.
+        max_stock (int | None): Highest stock quantity to include.
+        created_from (datetime | None): Only products created at or after this date.
+        created_to (datetime | None): Only products created at or before this date.
+    """
+    
+    min_price: float | None = None
+    max_price: float | None = None
+    min_stock: int | None = None
+    max_stock: int | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    
+class ProductPage(BaseModel):
+    """
+    Pydantic model for one page of the product listing.
+
+    Attributes:
+        items (List[Product]): The products of the page.
+        next_cursor (str | None): Cursor of the next page, None on the last page.
+    """
+    
+    items: List[Product]
+    next_cursor: str | None = None
+    
+class BulkProductConflict(BaseModel):
+    """
+    Pydantic model for a row rejected by the bulk product import.
+
+    Attributes:
+        row (int): 1-based position of the row in the payload.
+        name (str | None): The product name of the row, if it could be read.
+        detail (str): Why the row was rejected.
+    """
+    
+    row: int
+    name: str | None = None
+    detail: str
+    
+class BulkProductResult(BaseModel):
+    """
+    Pydantic model for the report of a bulk product import.
+
+    Attributes:
+        created (int): Number of products inserted.
+        conflicts (List[BulkProductConflict]): Rows that were not inserted.
+    """
+    
+    created: int
+    conflicts: List[BulkProductConflict]
@@ -0,0 +1,31 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+class ProductSales(BaseModel):
+    """
+    Pydantic model for the sales of a product.
+
+    Attributes:
+        product_name (str): The name of the product.
+        orders_count (int): Number of orders of the product.
+        revenue (float): Sum of the totals of those orders.
+    """
+    
+    product_name: str
+    orders_count: int
+    revenue: float
+    
+class DailyRevenue(BaseModel):
+    """
+    Pydantic model for the revenue of a day.
+
+    Attributes:
+        day (date): The day the orders were placed.
+        orders_count (int): Number of orders placed that day.
+        revenue (float): Sum of the totals of those orders.
+    """
+    
+    day: date
+    orders_count: int
+    revenue: float
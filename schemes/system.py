@@ -0,0 +1,131 @@
+from datetime import datetime
+from typing import Dict
+
+from pydantic import BaseModel
+
+class PoolStatus(BaseModel):
+    """
+    Pydantic model for the live statistics of a connection pool.
+
+    Attributes:
+        pool (str): The pool class in use.
+        size (int | None): Configured number of persistent connections.
+        checked_in (int | None): Idle connections available in the pool.
+        checked_out (int | None): Connections currently in use.
+        overflow (int | None): Overflow connections currently open.
+        max_overflow (int | None): Maximum number of overflow connections.
+        timeout (float | None): Seconds a checkout waits before timing out.
+        checkouts (int | None): Successful checkouts since startup.
+        timeouts (int | None): Checkouts that timed out since startup.
+        total_wait_ms (float | None): Accumulated checkout wait.
+        avg_wait_ms (float | None): Average checkout wait.
+        max_wait_ms (float | None): Longest checkout wait.
+    """
+    
+    pool: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    max_overflow: int | None = None
+    timeout: float | None = None
+    checkouts: int | None = None
+    timeouts: int | None = None
+    total_wait_ms: float | None = None
+    avg_wait_ms: float | None = None
+    max_wait_ms: float | None = None
+    
+class PoolsStatus(BaseModel):
+    """
+    Pydantic model grouping the statistics of every engine pool.
+
+    Attributes:
+        sync (PoolStatus): Pool of the sync engine.
+        async_ (PoolStatus): Pool of the async engine, serialized as `async`.
+    """
+    
+    sync: PoolStatus
+    async_: PoolStatus
+    
+    class Config:
+        """
+        Pydantic configuration to expose `async_` as `async`.
+        """
+        fields = {"async_": "async"}
+        allow_population_by_field_name = True
+
+class CacheStatus(BaseModel):
+    """
+    Pydantic model for the size and hit/miss counters of an in-process cache.
+
+    Attributes:
+        size (int): Entries currently stored.
+        maxsize (int): Maximum number of entries.
+        ttl (float): Seconds an entry stays valid.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that went to the database.
+        hit_ratio (float): hits / (hits + misses).
+    """
+    
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+    hit_ratio: float
+    
+class CachesStatus(BaseModel):
+    """
+    Pydantic model grouping the statistics of the in-process caches.
+
+    Attributes:
+        product_catalog (CacheStatus): Product name to snapshot cache used by order creation.
+        users (CacheStatus): User row cache used by authentication.
+    """
+    
+    product_catalog: CacheStatus
+    users: CacheStatus
+
+class ReadinessStatus(BaseModel):
+    """
+    Pydantic model for the readiness of the worker.
+
+    Attributes:
+        ready (bool): Whether both connection pools hold a warm connection.
+        startup_ms (float | None): Time from import to the end of the startup handlers.
+        warmup_ms (float | None): Time from import to ready.
+        error (str | None): Last database error of the warmup, None once ready.
+    """
+    
+    ready: bool
+    startup_ms: float | None = None
+    warmup_ms: float | None = None
+    error: str | None = None
+    
+class SchedulerStatus(BaseModel):
+    """
+    Pydantic model for the configuration and counters of the order status scheduler.
+
+    Attributes:
+        enabled (bool): Whether the scheduler runs in this worker.
+        interval (float): Seconds between two runs.
+        batch_size (int): Orders updated per statement and commit.
+        max_batches (int): Maximum number of batches per run.
+        runs (int): Completed runs since startup.
+        failed_runs (int): Runs aborted by an error.
+        rows (Dict[str, int]): Orders moved since startup, per transition.
+        last_run_rows (int): Orders moved by the last run.
+        last_run_seconds (float): Duration of the last run.
+        last_run_at (datetime | None): When the last run finished.
+    """
+    
+    enabled: bool
+    interval: float
+    batch_size: int
+    max_batches: int
+    runs: int
+    failed_runs: int
+    rows: Dict[str, int]
+    last_run_rows: int
+    last_run_seconds: float
+    last_run_at: datetime | None = None
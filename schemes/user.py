@@ -33,3 +33,39 @@ class User(UserCreate):
         Pydantic configuration for ORM mode.
         """
         orm_mode = True
+    
+class UserProfile(BaseModel):
+    """
+    Pydantic model of a user without the password hash, as kept in the user cache.
+
+    Attributes:
+        user_id (int): The unique identifier for the user.
+        username (str): The username of the user.
+        email (EmailStr): The email address of the user.
+        name (str): The name of the user.
+        address (str): The address of the user.
+    """
+    
+    user_id: int
+    username: str
+    email: EmailStr
+    name: str
+    address: str
+    
+    class Config:
+        """
+        Pydantic configuration for ORM mode.
+        """
+        orm_mode = True
+    
+class TokenUser(BaseModel):
+    """
+    Pydantic model for the user identity carried by an access token.
+
+    Attributes:
+        user_id (int): The unique identifier for the user.
+        username (str): The username of the user.
+    """
+    
+    user_id: int
+    username: str
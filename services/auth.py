@@ -1,17 +1,28 @@
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from data_access.user import UserAccess
-from database.get_db import get_db
-from passlib.context import CryptContext
+from data_access.user import AsyncUserAccess, UserAccess
+from database.get_db import get_reader_db
 from jose import jwt, JWTError
 from os import getenv
 from dotenv import load_dotenv
 from datetime import timedelta, datetime
 from models.user import User
+from schemes.user import TokenUser, UserProfile
+from services.cache import TTLCache
+from services.hashing import password_hasher, verify_and_update
 
 load_dotenv()
 
+SECRET_KEY = getenv("SECRET_KEY")
+ALGORITHM = "HS256"
+
+JWT_STATELESS = getenv("JWT_STATELESS", "true").lower() in ("1", "true", "yes")
+
+user_cache = TTLCache(maxsize=int(getenv("USER_CACHE_SIZE", "1024")),
+                      ttl=float(getenv("USER_CACHE_TTL", "60")))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
 class AuthService:
@@ -20,16 +31,15 @@ class AuthService:
     """
     
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session | AsyncSession) -> None:
         """
         Initializes the AuthService with the database session.
 
         Parameters:
-        - `db`: SQLAlchemy database session.
+        - `db`: SQLAlchemy database session, or an async session for `authenticate_user_async`.
         """
         
         self.db = db
-        self.crypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         
     def verify_password(self, password: str, db_password: str):
         """
@@ -43,9 +53,8 @@ class AuthService:
         - `True` if passwords match, `False` otherwise.
         """
         
-        if password == db_password:
-            return True
-        return False
+        valid, _ = verify_and_update(password, db_password)
+        return valid
         
     def authenticate_user(self, username: str, password: str):
         """
@@ -68,6 +77,43 @@ class AuthService:
         
         return user
     
+    async def authenticate_user_async(self, username: str, password: str):
+        """
+        Authenticates a user on an async database session.
+
+        The password is checked in the bounded hashing pool so bcrypt never runs
+        on the event loop. If the stored hash was made with outdated cost
+        parameters, or is a legacy plaintext password, it is replaced.
+
+        Parameters:
+        - `username`: Username of the user.
+        - `password`: Password for authentication.
+
+        Returns:
+        - User object if authentication is successful, `None` otherwise.
+
+        Raises:
+        - HTTPException with 503 status if the hashing queue is full.
+        """
+        
+        user_data_access = AsyncUserAccess(db=self.db)
+        
+        user = await user_data_access.get_user_by_username(username=username)
+        
+        if not user:
+            return None
+        
+        valid, new_hash = await password_hasher.verify_and_update(password, user.password)
+        
+        if not valid:
+            return None
+        
+        if new_hash:
+            await user_data_access.update_password(user=user, password=new_hash)
+            user_cache.pop(username)
+        
+        return user
+    
     async def decode_token(self, token: str):
         """
         Decodes a JWT token and verifies its validity.
@@ -83,7 +129,7 @@ class AuthService:
         """
         
         try:
-            return jwt.decode(token, getenv("SECRET_KEY"), algorithms=["HS256"])
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,35 +158,100 @@ class AuthService:
     
         to_encode.update({"exp": expire})
     
-        encoded_jwt = jwt.encode(to_encode, getenv("SECRET_KEY"), algorithm="HS256")
+        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
-    def get_current_user(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    def get_current_user(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_reader_db)):
         """
         Retrieves the current user from the JWT token.
 
+        When `JWT_STATELESS` is enabled and the token carries the `uid` claim, the
+        user is rebuilt from the token claims without querying the database.
+        Otherwise the full user row is loaded through `get_current_user_row`.
+
         Parameters:
         - `token`: JWT token containing user information.
+        - `db`: SQLAlchemy read-only database session, only used when the row has to be loaded.
 
         Returns:
-        - TokenData object with the username.
+        - TokenUser with the id and username, or the full user.
 
         Raises:
         - HTTPException with 401 status if the token is not valid.
         """
         
+        payload = self._decode_claims(token)
+        
+        if JWT_STATELESS and payload.get("uid") is not None:
+            return TokenUser(user_id=payload["uid"], username=payload["sub"])
+        
+        return self._load_user(username=payload["sub"], db=db)
+    
+    def get_current_user_row(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_reader_db)):
+        """
+        Retrieves the full user row of the JWT token's subject.
+
+        Rows are served from a bounded TTL cache (`USER_CACHE_SIZE`, `USER_CACHE_TTL`)
+        before falling back to the database.
+
+        Parameters:
+        - `token`: JWT token containing user information.
+        - `db`: SQLAlchemy database session.
+
+        Returns:
+        - The user profile, every column but the password hash.
+
+        Raises:
+        - HTTPException with 401 status if the token is not valid or the user no longer exists.
+        """
+        
+        payload = self._decode_claims(token)
+        
+        return self._load_user(username=payload["sub"], db=db)
+    
+    def _decode_claims(self, token: str):
+        """
+        Decodes the token and checks it has a subject, raising 401 otherwise.
+        """
+        
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
         
-        payload = jwt.decode(token, getenv("SECRET_KEY"), algorithms=["HS256"])
-        username: str = payload.get("sub")
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise credentials_exception
         
-        if username is None:
+        if payload.get("sub") is None:
             raise credentials_exception
         
-        user_data_access = UserAccess(db=db)    
+        return payload
+    
+    def _load_user(self, username: str, db: Session):
+        """
+        Returns the user from the cache or the database, raising 401 if it does not exist.
+
+        The cached profile leaves out the password hash, so the process-wide
+        cache never holds credentials.
+        """
         
-        return user_data_access.get_user_by_username(username=username)
\ No newline at end of file
+        user = user_cache.get(username)
+        
+        if user is None:
+            user_data_access = UserAccess(db=db)
+            db_user = user_data_access.get_user_by_username(username=username)
+            
+            if db_user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Could not validate credentials",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            
+            user = UserProfile.from_orm(db_user)
+            user_cache.set(username, user)
+        
+        return user
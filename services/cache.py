@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded in-memory cache whose entries expire after a TTL.
+
+    When the cache is full the least recently used entry is evicted.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept.
+        ttl (float): Seconds an entry stays valid after it is set.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that found no valid entry.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        Initializes an empty cache.
+
+        Parameters:
+        - `maxsize` (int): Maximum number of entries kept.
+        - `ttl` (float): Seconds an entry stays valid after it is set.
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored under `key`, or `default` if it is missing or expired.
+        """
+
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value) -> None:
+        """
+        Stores `value` under `key`, evicting the least recently used entry if full.
+        """
+
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Removes `key` from the cache and returns its value, or `default` if missing.
+        """
+
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache.
+        """
+
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """
+        Returns the size and hit/miss counters of the cache.
+        """
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,170 @@
+import logging
+from os import getenv
+from typing import NamedTuple
+
+from dotenv import load_dotenv
+from data_access.product import ProductAccess
+from services.cache import TTLCache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+class ProductSnapshot(NamedTuple):
+    """
+    Cached view of a product used on the order path.
+
+    Attributes:
+        product_id (int): The unique identifier for the product.
+        price (Decimal): The price of the product.
+        stock (int): Stock when the snapshot was taken; the conditional UPDATE on
+            order creation remains the authority on availability.
+    """
+
+    product_id: int
+    price: object
+    stock: int
+
+class ProductCatalog:
+    """
+    Read-through, size-bounded cache mapping product names to snapshots.
+
+    Products are cached when read or created and expire after a TTL as a safety
+    net against changes made by other workers. Unknown names are not cached.
+
+    Attributes:
+        cache (TTLCache): The underlying cache, also holding the hit/miss counters.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        Initializes an empty catalog.
+
+        Parameters:
+        - `maxsize` (int): Maximum number of products kept.
+        - `ttl` (float): Seconds a snapshot stays valid.
+        """
+
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def put(self, product) -> ProductSnapshot:
+        """
+        Stores or replaces the snapshot of a product.
+
+        Parameters:
+        - `product`: Any object with product_id, name, price and stock attributes.
+
+        Returns:
+        - The stored snapshot.
+        """
+
+        snapshot = ProductSnapshot(product_id=product.product_id, price=product.price, stock=product.stock)
+        self.cache.set(product.name, snapshot)
+        return snapshot
+
+    def mark_sold_out(self, name: str, snapshot: ProductSnapshot) -> None:
+        """
+        Records that a product has no stock left, so later orders fail without a query.
+        """
+
+        self.cache.set(name, snapshot._replace(stock=0))
+
+    def invalidate(self, name: str) -> None:
+        """
+        Drops the snapshot of a product.
+        """
+
+        self.cache.pop(name)
+
+    def get(self, name: str, product_access: ProductAccess) -> ProductSnapshot | None:
+        """
+        Returns the snapshot of a product, loading it from the database on a miss.
+
+        Parameters:
+        - `name` (str): The product name.
+        - `product_access` (ProductAccess): Used to load the product on a miss.
+
+        Returns:
+        - The snapshot, or None if the product does not exist.
+        """
+
+        snapshot = self.cache.get(name)
+
+        if snapshot is None:
+            db_product = product_access.get_product_by_name(name=name)
+            if db_product is None:
+                return None
+            snapshot = self.put(db_product)
+
+        return snapshot
+
+    async def get_async(self, name: str, product_access) -> ProductSnapshot | None:
+        """
+        Async counterpart of `get`, loading a miss through an AsyncProductAccess.
+        """
+
+        snapshot = self.cache.get(name)
+
+        if snapshot is None:
+            db_product = await product_access.get_product_by_name(name=name)
+            if db_product is None:
+                return None
+            snapshot = self.put(db_product)
+
+        return snapshot
+
+    def get_many(self, names: set, product_access: ProductAccess) -> dict:
+        """
+        Returns the snapshots of several products, loading every miss with one query.
+
+        Parameters:
+        - `names` (set): The product names.
+        - `product_access` (ProductAccess): Used to load the missing products.
+
+        Returns:
+        - Mapping of name to snapshot for the products that exist.
+        """
+
+        snapshots = {}
+        missing = set()
+
+        for name in names:
+            snapshot = self.cache.get(name)
+            if snapshot is None:
+                missing.add(name)
+            else:
+                snapshots[name] = snapshot
+
+        for db_product in product_access.get_products_by_names(names=missing):
+            snapshots[db_product.name] = self.put(db_product)
+
+        return snapshots
+
+    def warm(self, product_access: ProductAccess) -> int:
+        """
+        Fills the catalog with the most recent products, up to its size.
+
+        Returns:
+        - The number of products loaded.
+        """
+
+        products = product_access.get_catalog(limit=self.cache.maxsize)
+
+        for product in products:
+            self.put(product)
+
+        logger.info("Product catalog warmed with %d products", len(products))
+
+        return len(products)
+
+    def stats(self) -> dict:
+        """
+        Returns the size and hit/miss counters of the catalog.
+        """
+
+        return self.cache.stats()
+
+product_catalog = ProductCatalog(
+    maxsize=int(getenv("CATALOG_CACHE_SIZE", "10000")),
+    ttl=float(getenv("CATALOG_CACHE_TTL", "300")),
+)
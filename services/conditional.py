@@ -0,0 +1,54 @@
+from hashlib import sha1
+
+from fastapi import Request, Response, status
+
+def make_etag(*parts) -> str:
+    """
+    Builds a strong ETag from the values that identify a representation.
+
+    Parameters:
+    - `parts`: Cheap aggregates and request variants (query string, user) of the listing.
+
+    Returns:
+    - The quoted ETag value.
+    """
+
+    digest = sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Tells whether the client's `If-None-Match` header already matches the ETag.
+
+    Parameters:
+    - `request` (Request): The incoming request.
+    - `etag` (str): The current ETag of the representation.
+
+    Returns:
+    - `True` if a 304 Not Modified can be returned.
+    """
+
+    if_none_match = request.headers.get("if-none-match")
+
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return etag in candidates
+
+def not_modified_response(etag: str) -> Response:
+    """
+    Builds an empty 304 Not Modified response carrying the ETag.
+    """
+
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+
+def etag_headers(etag: str) -> dict:
+    """
+    Headers sent with every conditional response: the ETag and a directive to revalidate.
+    """
+
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
@@ -0,0 +1,116 @@
+import csv
+import io
+from datetime import date, datetime
+from decimal import Decimal
+from os import getenv
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import sessionmaker
+from data_access.order import ORDER_COLUMNS, OrderAccess
+from data_access.product import PRODUCT_COLUMNS, ProductAccess
+from schemes.export import ExportFormat
+from services.serialization import dumps
+
+load_dotenv()
+
+EXPORT_BATCH_SIZE = int(getenv("EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+def _csv_value(value):
+    """
+    Formats a column value for CSV the same way the JSON encoders do.
+    """
+    
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def _encode(batches, columns: list, export_format: ExportFormat):
+    """
+    Turns batches of column mappings into chunks of NDJSON or CSV bytes, one chunk per batch.
+    """
+    
+    if export_format == ExportFormat.ndjson:
+        for batch in batches:
+            yield b"".join(dumps(dict(row)) + b"\n" for row in batch)
+        return
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    
+    for batch in batches:
+        writer.writerows([_csv_value(row[column]) for column in columns] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+class ExportService:
+    """
+    Service class streaming products and orders as NDJSON or CSV.
+
+    Each export opens its own session for as long as the stream is consumed and
+    reads rows with one keyset-paginated query per batch, so memory stays flat
+    regardless of the number of rows or of server-side cursor support in the
+    driver, and the first chunk is sent after the first batch.
+
+    Attributes:
+        session_factory (sessionmaker): Creates the session used by each export.
+        batch_size (int): Number of rows fetched and encoded per chunk.
+    """
+    
+    def __init__(self, session_factory: sessionmaker, batch_size: int = EXPORT_BATCH_SIZE) -> None:
+        """
+        Initializes the ExportService.
+
+        Parameters:
+        - `session_factory` (sessionmaker): Creates the session used by each export.
+        - `batch_size` (int): Number of rows fetched and encoded per chunk.
+        """
+        
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        
+    def stream_products(self, export_format: ExportFormat, after_id: int | None = None):
+        """
+        Streams every product, optionally only those after a given product_id.
+
+        Yields:
+        - Chunks of encoded bytes.
+        """
+        
+        db = self.session_factory()
+        
+        try:
+            batches = ProductAccess(db=db).iter_products(batch_size=self.batch_size, after_id=after_id)
+            yield from _encode(batches, columns=[column.key for column in PRODUCT_COLUMNS],
+                               export_format=export_format)
+        finally:
+            db.close()
+            
+    def stream_orders(self, user_username: str, export_format: ExportFormat, after_id: int | None = None):
+        """
+        Streams every order of a user, optionally only those after a given order_id.
+
+        Yields:
+        - Chunks of encoded bytes.
+        """
+        
+        db = self.session_factory()
+        
+        try:
+            batches = OrderAccess(db=db).iter_orders(user_username=user_username, batch_size=self.batch_size,
+                                                     after_id=after_id)
+            yield from _encode(batches, columns=[column.key for column in ORDER_COLUMNS],
+                               export_format=export_format)
+        finally:
+            db.close()
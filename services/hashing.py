@@ -0,0 +1,148 @@
+import asyncio
+import hmac
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+from threading import Lock
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+load_dotenv()
+
+BCRYPT_ROUNDS = int(getenv("BCRYPT_ROUNDS", "12"))
+
+crypt_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+def verify_and_update(password: str, stored_password: str | None):
+    """
+    Verifies a password and tells whether its stored hash must be replaced.
+
+    A new hash is returned when the stored one was made with different cost
+    parameters, or when the stored value is a legacy plaintext password.
+
+    Parameters:
+    - `password` (str): Password to be verified.
+    - `stored_password` (str | None): Value stored in the database.
+
+    Returns:
+    - Tuple `(valid, new_hash)`, where `new_hash` is None if no rehash is needed.
+    """
+
+    if not stored_password:
+        return False, None
+
+    if crypt_context.identify(stored_password) is None:
+        if hmac.compare_digest(password.encode(), stored_password.encode()):
+            return True, crypt_context.hash(password)
+        return False, None
+
+    return crypt_context.verify_and_update(password, stored_password)
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated, size-limited thread pool.
+
+    At most `max_pending` hashing jobs may be queued or running at once; further
+    requests are rejected with 503 so a login storm sheds load instead of
+    starving the rest of the application.
+
+    Attributes:
+        max_workers (int): Number of hashing threads.
+        max_pending (int): Maximum number of queued plus running jobs.
+        rejected (int): Number of jobs rejected because the queue was full.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        """
+        Initializes the hasher and its thread pool.
+
+        Parameters:
+        - `max_workers` (int): Number of hashing threads.
+        - `max_pending` (int): Maximum number of queued plus running jobs.
+        """
+
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.rejected = 0
+        self._pending = 0
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of jobs currently queued or running.
+        """
+
+        return self._pending
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests, try again later",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def _run(self, function, *args):
+        self._acquire()
+        try:
+            return await asyncio.wrap_future(self._executor.submit(function, *args))
+        finally:
+            self._release()
+
+    async def verify_and_update(self, password: str, stored_password: str | None):
+        """
+        Verifies a password off the event loop.
+
+        Returns:
+        - Tuple `(valid, new_hash)` as returned by `verify_and_update`.
+
+        Raises:
+        - HTTPException with 503 status if the hashing queue is full.
+        """
+
+        return await self._run(verify_and_update, password, stored_password)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hashes a password off the event loop.
+
+        Raises:
+        - HTTPException with 503 status if the hashing queue is full.
+        """
+
+        return await self._run(crypt_context.hash, password)
+
+    def hash_sync(self, password: str) -> str:
+        """
+        Hashes a password from a worker thread, blocking until the job is done.
+
+        Raises:
+        - HTTPException with 503 status if the hashing queue is full.
+        """
+
+        self._acquire()
+        try:
+            return self._executor.submit(crypt_context.hash, password).result()
+        finally:
+            self._release()
+
+password_hasher = PasswordHasher(
+    max_workers=int(getenv("PASSWORD_HASH_WORKERS", "2")),
+    max_pending=int(getenv("PASSWORD_HASH_MAX_PENDING", "32")),
+)
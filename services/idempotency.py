@@ -0,0 +1,347 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from os import getenv
+from threading import Lock
+from typing import NamedTuple
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from data_access.idempotency import AsyncIdempotencyAccess, IdempotencyAccess
+from services.cache import TTLCache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_TTL = float(getenv("IDEMPOTENCY_TTL", "86400"))
+IDEMPOTENCY_CACHE_SIZE = int(getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+IDEMPOTENCY_ABANDON_AFTER = float(getenv("IDEMPOTENCY_ABANDON_AFTER", "60"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 128
+
+class StoredResponse(NamedTuple):
+    """
+    Response kept for an idempotency key.
+
+    Attributes:
+        request_hash (str): SHA-256 of the request payload the key was first used with.
+        status_code (int): Status code of the response.
+        body (str): JSON body of the response.
+    """
+
+    request_hash: str
+    status_code: int
+    body: str
+
+class IdempotencyStore:
+    """
+    In-process part of the idempotency keys: a bounded TTL cache of stored
+    responses and the counters.
+
+    The cache answers retries without a query. The `idempotency_keys` table
+    behind it survives restarts and is shared by every worker: a key is
+    claimed there before its request runs, so two workers never run the
+    same key.
+
+    Attributes:
+        ttl (float): Seconds a response can be replayed.
+        abandon_after (float): Seconds after which a claimed key without a response is taken over.
+        cache (TTLCache): Stored responses per scoped key.
+        replays (int): Responses replayed since startup.
+        conflicts (int): Requests rejected because their key was in flight or reused.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, abandon_after: float) -> None:
+        """
+        Initializes an empty store.
+
+        Parameters:
+        - `maxsize` (int): Maximum number of responses cached.
+        - `ttl` (float): Seconds a response can be replayed.
+        - `abandon_after` (float): Seconds after which a claimed key without a response is taken over.
+        """
+
+        self.ttl = ttl
+        self.abandon_after = abandon_after
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.replays = 0
+        self.conflicts = 0
+        self._lock = Lock()
+
+    def in_flight(self) -> HTTPException:
+        """
+        Counts a request whose key is still running and returns the error to raise.
+        """
+
+        with self._lock:
+            self.conflicts += 1
+
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed",
+        )
+
+    def replay(self, stored: StoredResponse, request_hash: str) -> Response:
+        """
+        Builds the response to send again for a retried request.
+
+        Raises:
+        - HTTPException with 422 status if the key was first used with a different payload.
+        """
+
+        with self._lock:
+            if stored.request_hash != request_hash:
+                self.conflicts += 1
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used with a different request",
+                )
+            self.replays += 1
+
+        return Response(content=stored.body, status_code=stored.status_code, media_type="application/json",
+                        headers={"Idempotent-Replayed": "true"})
+
+    def expired_before(self) -> datetime:
+        """
+        Returns the date before which claimed keys have expired.
+        """
+
+        return datetime.utcnow() - timedelta(seconds=self.ttl)
+
+    def claim_options(self) -> dict:
+        """
+        Returns the dates passed to `claim_key` to replace expired and abandoned keys.
+        """
+
+        now = datetime.utcnow()
+        return {"expired_before": now - timedelta(seconds=self.ttl),
+                "abandoned_before": now - timedelta(seconds=self.abandon_after)}
+
+    def prometheus_lines(self) -> list:
+        """
+        Renders the counters in the Prometheus text exposition format.
+        """
+
+        return [
+            "# HELP idempotency_replays_total Responses replayed for a retried Idempotency-Key.",
+            "# TYPE idempotency_replays_total counter",
+            f"idempotency_replays_total {self.replays}",
+            "# HELP idempotency_conflicts_total Requests rejected because their Idempotency-Key was in flight or reused.",
+            "# TYPE idempotency_conflicts_total counter",
+            f"idempotency_conflicts_total {self.conflicts}",
+            "# HELP idempotency_cached_keys Idempotency keys currently cached.",
+            "# TYPE idempotency_cached_keys gauge",
+            f"idempotency_cached_keys {len(self.cache)}",
+        ]
+
+idempotency_store = IdempotencyStore(maxsize=IDEMPOTENCY_CACHE_SIZE, ttl=IDEMPOTENCY_TTL,
+                                     abandon_after=IDEMPOTENCY_ABANDON_AFTER)
+
+def scoped_key(request: Request, username: str, key: str) -> str:
+    """
+    Scopes a client key by user and route, so two users or two routes never share a response.
+    """
+
+    return f"{username}:{request.method} {request.url.path}:{key}"
+
+def request_fingerprint(payload) -> str:
+    """
+    Returns the SHA-256 of a request payload, independent of its key order.
+    """
+
+    encoded = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def _stored(row) -> StoredResponse:
+    return StoredResponse(request_hash=row.request_hash, status_code=row.status_code, body=row.body)
+
+class IdempotencyService:
+    """
+    Service class running a write at most once per `Idempotency-Key`.
+
+    Parameters:
+    - `db` (Session): The SQLAlchemy database session.
+    """
+
+    def __init__(self, db: Session) -> None:
+        """
+        Initializes the IdempotencyService.
+
+        Parameters:
+        - `db` (Session): The SQLAlchemy database session.
+        """
+
+        self.db = db
+        self.idempotency_access = IdempotencyAccess(db=db)
+
+    def _claim(self, key: str, request_hash: str):
+        """
+        Claims `key` in the table, or returns the response already stored for it.
+
+        Raises:
+        - HTTPException with 409 status if another request holds the key.
+        """
+
+        try:
+            self.idempotency_access.claim_key(key=key, request_hash=request_hash,
+                                              **idempotency_store.claim_options())
+            return None
+        except IntegrityError:
+            self.db.rollback()
+
+        row = self.idempotency_access.get_key(key=key)
+        if row is None or row.status_code is None:
+            raise idempotency_store.in_flight()
+
+        stored = _stored(row)
+        idempotency_store.cache.set(key, stored)
+        return stored
+
+    def _release(self, key: str) -> None:
+        """
+        Frees `key` after its request failed; if that fails too, the key is taken over once abandoned.
+        """
+
+        try:
+            self.db.rollback()
+            self.idempotency_access.release_key(key=key)
+        except SQLAlchemyError:
+            self.db.rollback()
+            logger.warning("Could not release idempotency key %s", key, exc_info=True)
+
+    def run(self, request: Request, username: str, key: str | None, payload, handler, response_model,
+            status_code: int = status.HTTP_200_OK):
+        """
+        Runs `handler` once per key, replaying its stored response on retries.
+
+        Without a key the handler simply runs. With one, a response cached in
+        memory is replayed without any query. Otherwise the key is claimed in
+        the table, which replays the response stored by another worker or
+        before a restart, and rejects the request while another one holds the
+        key; then the handler runs and its response is stored. Failed
+        requests release the key, so they can be retried with it.
+
+        Parameters:
+        - `request` (Request): The incoming request, used to scope the key by route.
+        - `username` (str): The authenticated user.
+        - `key` (str | None): The `Idempotency-Key` header.
+        - `payload`: The request body, fingerprinted to detect a reused key.
+        - `handler`: Callable performing the write and returning an ORM object.
+        - `response_model`: Pydantic model (orm_mode) the response is serialized with.
+        - `status_code` (int): Status code of a successful response.
+
+        Returns:
+        - The response model built from the handler's result, or the replayed response.
+
+        Raises:
+        - HTTPException: 409 if the key is still in flight, 422 if it was used with
+          a different payload, or whatever the handler raises.
+        """
+
+        if key is None:
+            return handler()
+
+        key = scoped_key(request=request, username=username, key=key)
+        request_hash = request_fingerprint(payload)
+
+        stored = idempotency_store.cache.get(key) or self._claim(key, request_hash)
+        if stored is not None:
+            return idempotency_store.replay(stored, request_hash)
+
+        try:
+            result = response_model.from_orm(handler())
+        except BaseException:
+            self._release(key)
+            raise
+
+        stored = StoredResponse(request_hash=request_hash, status_code=status_code, body=result.json())
+        self.idempotency_access.complete_key(key=key, status_code=stored.status_code, body=stored.body)
+        idempotency_store.cache.set(key, stored)
+
+        return result
+
+    def purge_expired(self) -> int:
+        """
+        Deletes the keys claimed more than `IDEMPOTENCY_TTL` seconds ago.
+
+        Returns:
+        - The number of keys deleted.
+        """
+
+        return self.idempotency_access.delete_expired(created_before=idempotency_store.expired_before())
+
+class AsyncIdempotencyService:
+    """
+    Service class running a write at most once per `Idempotency-Key`, on an async session.
+
+    Parameters:
+    - `db` (AsyncSession): The SQLAlchemy async database session.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Initializes the AsyncIdempotencyService.
+
+        Parameters:
+        - `db` (AsyncSession): The SQLAlchemy async database session.
+        """
+
+        self.db = db
+        self.idempotency_access = AsyncIdempotencyAccess(db=db)
+
+    async def _claim(self, key: str, request_hash: str):
+        try:
+            await self.idempotency_access.claim_key(key=key, request_hash=request_hash,
+                                                    **idempotency_store.claim_options())
+            return None
+        except IntegrityError:
+            await self.db.rollback()
+
+        row = await self.idempotency_access.get_key(key=key)
+        if row is None or row.status_code is None:
+            raise idempotency_store.in_flight()
+
+        stored = _stored(row)
+        idempotency_store.cache.set(key, stored)
+        return stored
+
+    async def _release(self, key: str) -> None:
+        try:
+            await self.db.rollback()
+            await self.idempotency_access.release_key(key=key)
+        except SQLAlchemyError:
+            await self.db.rollback()
+            logger.warning("Could not release idempotency key %s", key, exc_info=True)
+
+    async def run(self, request: Request, username: str, key: str | None, payload, handler, response_model,
+                  status_code: int = status.HTTP_200_OK):
+        """
+        Async counterpart of `IdempotencyService.run`; `handler` returns an awaitable.
+        """
+
+        if key is None:
+            return await handler()
+
+        key = scoped_key(request=request, username=username, key=key)
+        request_hash = request_fingerprint(payload)
+
+        stored = idempotency_store.cache.get(key) or await self._claim(key, request_hash)
+        if stored is not None:
+            return idempotency_store.replay(stored, request_hash)
+
+        try:
+            result = response_model.from_orm(await handler())
+        except BaseException:
+            await self._release(key)
+            raise
+
+        stored = StoredResponse(request_hash=request_hash, status_code=status_code, body=result.json())
+        await self.idempotency_access.complete_key(key=key, status_code=stored.status_code, body=stored.body)
+        idempotency_store.cache.set(key, stored)
+
+        return result
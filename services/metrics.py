@@ -0,0 +1,213 @@
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+
+from database.pool import pool_status
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "unmatched"
+
+class RequestMetrics:
+    """
+    In-process registry of HTTP request metrics.
+
+    Latencies are kept as one histogram per (method, route, status) series,
+    where route is the path template of the matched route, so path parameters
+    and unknown URLs do not create new series. Recording is one bisect and a
+    few additions under a lock.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the latency buckets, in seconds.
+        in_flight (int): Requests currently being served.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS) -> None:
+        """
+        Initializes an empty registry.
+
+        Parameters:
+        - `buckets` (tuple): Upper bounds of the latency buckets, in seconds.
+        """
+
+        self.buckets = buckets
+        self.in_flight = 0
+        self._series = {}
+        self._lock = Lock()
+
+    def start(self) -> None:
+        """
+        Counts a request as in flight.
+        """
+
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self, method: str, route: str, status_code: int, duration: float) -> None:
+        """
+        Records a finished request.
+
+        Parameters:
+        - `method` (str): The HTTP method.
+        - `route` (str): The path template of the matched route.
+        - `status_code` (int): The response status.
+        - `duration` (float): Seconds spent serving the request.
+        """
+
+        index = bisect_left(self.buckets, duration)
+        key = (method, route, status_code)
+
+        with self._lock:
+            self.in_flight -= 1
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += duration
+
+    def snapshot(self) -> dict:
+        """
+        Returns a copy of every series as `{key: (bucket_counts, total_seconds)}`.
+        """
+
+        with self._lock:
+            return {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+
+    def render(self, engines: dict) -> str:
+        """
+        Renders the request metrics and the pool statistics of `engines` in the
+        Prometheus text exposition format.
+
+        Parameters:
+        - `engines` (dict): Mapping of label to engine whose pool is reported.
+
+        Returns:
+        - The metrics document.
+        """
+
+        series = sorted(self.snapshot().items())
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Requests served.",
+            "# TYPE http_requests_total counter",
+        ]
+
+        for (method, route, status_code), (counts, _) in series:
+            lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status_code}"}} {sum(counts)}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+
+        for (method, route, status_code), (counts, total) in series:
+            labels = f'method="{method}",route="{route}",status="{status_code}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+        lines += _pool_lines(engines)
+
+        return "\n".join(lines) + "\n"
+
+_POOL_METRICS = (
+    ("size", "db_pool_size", "gauge", "Configured number of persistent connections."),
+    ("checked_out", "db_pool_checked_out", "gauge", "Connections currently in use."),
+    ("checked_in", "db_pool_checked_in", "gauge", "Idle connections available in the pool."),
+    ("overflow", "db_pool_overflow", "gauge", "Overflow connections currently open."),
+    ("checkouts", "db_pool_checkouts_total", "counter", "Successful checkouts."),
+    ("timeouts", "db_pool_timeouts_total", "counter", "Checkouts that timed out."),
+    ("total_wait_ms", "db_pool_wait_milliseconds_total", "counter", "Accumulated checkout wait."),
+    ("max_wait_ms", "db_pool_max_wait_milliseconds", "gauge", "Longest checkout wait."),
+)
+
+def _pool_lines(engines: dict) -> list:
+    """
+    Renders the statistics of each engine's pool, skipping the figures a pool class does not provide.
+    """
+
+    statuses = {label: pool_status(engine) for label, engine in engines.items()}
+    lines = []
+
+    for field, name, kind, description in _POOL_METRICS:
+        values = [(label, status[field]) for label, status in statuses.items() if status.get(field) is not None]
+        if not values:
+            continue
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+        lines += [f'{name}{{engine="{label}"}} {value}' for label, value in values]
+
+    return lines
+
+class MetricsMiddleware:
+    """
+    ASGI middleware feeding a `RequestMetrics` registry.
+
+    Written against the raw ASGI interface rather than as an `http` middleware
+    function, so it adds no task or request object per request.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics) -> None:
+        """
+        Wraps an ASGI application.
+
+        Parameters:
+        - `app`: The wrapped application.
+        - `metrics` (RequestMetrics): The registry to record into.
+        """
+
+        self.app = app
+        self.metrics = metrics
+        self._routes = {}
+
+    def _route(self, scope) -> str:
+        """
+        Returns the path template of the route that served the request.
+        """
+
+        endpoint = scope.get("endpoint")
+
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+
+        route = self._routes.get(endpoint)
+
+        if route is None:
+            route = UNMATCHED_ROUTE
+            for candidate in scope["app"].routes:
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    route = candidate.path
+                    break
+            self._routes[endpoint] = route
+
+        return route
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.metrics.start()
+        start = perf_counter()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.finish(method=scope["method"], route=self._route(scope),
+                                status_code=status_code, duration=perf_counter() - start)
+
+request_metrics = RequestMetrics()
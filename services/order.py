@@ -1,12 +1,15 @@
 from datetime import datetime, timedelta
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from data_access.order import OrderAccess
+from data_access.order import AsyncOrderAccess, OrderAccess
 from data_access.user import UserAccess
-from data_access.product import ProductAccess
-from schemes.order import OrderBase, OrderCreate
+from data_access.product import AsyncProductAccess, ProductAccess
+from schemes.order import CheckoutError, OrderBase, OrderCreate
 from models.order import Order
+from services.catalog import product_catalog
 
 class OrderService:
     """
@@ -35,6 +38,13 @@ class OrderService:
         """
         Creates a new order for a user.
 
+        The order is inserted first, so a second order for the same product is
+        rejected by the unique constraint on the orders table before the
+        product row is touched. One unit of the product's stock is then
+        reserved with a conditional UPDATE in the same transaction; if none is
+        left, the insert is rolled back. The product is read through the
+        in-process catalog cache.
+
         Parameters:
         - `new_order` (OrderBase): The order details.
         - `user_username` (str): The username of the user placing the order.
@@ -43,10 +53,10 @@ class OrderService:
         - The created order.
 
         Raises:
-        - HTTPException: If the product is not found or the user already has an active order with the product.
+        - HTTPException: If the product is not found, the user already has an active order with the product or it is out of stock.
         """
         
-        db_product = self.product_accesss.get_product_by_name(name=new_order.product_name)
+        db_product = product_catalog.get(name=new_order.product_name, product_access=self.product_accesss)
         
         if not db_product:
             raise HTTPException(
@@ -54,17 +64,241 @@ class OrderService:
                 detail="Product not found"
             )
             
-        db_order = self.order_access.verify_order_of_user(user_username=user_username, product_name=new_order.product_name)
+        order_date = datetime.utcnow()
+        dead_line = order_date + timedelta(days=7)
+            
+        new_order_with_date = OrderCreate(**new_order.dict(), order_date=order_date, dead_line=dead_line, total=db_product.price, user_username=user_username)
         
-        if db_order:
+        try:
+            db_order = self.order_access.add_order(new_order=new_order_with_date)
+        except IntegrityError:
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="You already have an active order with this product"
             )
             
+        if db_product.stock <= 0 or not self.product_accesss.reserve_stock(product_ids=[db_product.product_id]):
+            self.db.rollback()
+            product_catalog.mark_sold_out(name=new_order.product_name, snapshot=db_product)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Product is out of stock"
+            )
+        
+        return self.order_access.commit_order(db_order=db_order, new_order=new_order_with_date)
+    
+    def get_order(self, order_id: int, user_username: str):
+        """
+        Retrieves one of the user's orders with its product embedded.
+
+        Parameters:
+        - `order_id` (int): The order identifier.
+        - `user_username` (str): The username of the user.
+
+        Returns:
+        - The order with its product loaded.
+
+        Raises:
+        - HTTPException: 404 if the order does not exist or belongs to another user.
+        """
+        
+        db_order = self.order_access.get_order_with_product(order_id=order_id, user_username=user_username)
+        
+        if db_order is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order not found"
+            )
+        
+        return db_order
+    
+    def checkout(self, items: list, user_username: str):
+        """
+        Creates one order per item in a single transaction.
+
+        All products (through the catalog cache) and the user's existing orders for
+        them are resolved with one `IN` query each. The orders are inserted first,
+        so the unique constraint rejects a duplicate before any stock is touched;
+        then one unit of stock of every product is reserved with a single
+        conditional UPDATE, and everything is committed once. If any item is
+        rejected, the transaction is rolled back: no order is created and no stock is taken.
+
+        Parameters:
+        - `items` (List[OrderBase]): The products to order, with their notes.
+        - `user_username` (str): The username of the user placing the orders.
+
+        Returns:
+        - The created orders.
+
+        Raises:
+        - HTTPException: 409 with one error per rejected item if a product is not found,
+          is already ordered by the user, appears more than once or is out of stock.
+        """
+        
+        product_names = {item.product_name for item in items}
+        
+        db_products = product_catalog.get_many(names=product_names, product_access=self.product_accesss)
+        ordered_names = self.order_access.get_ordered_product_names(user_username=user_username,
+                                                                    product_names=product_names)
+        
+        errors = []
+        seen_names = set()
+        
+        for index, item in enumerate(items):
+            if item.product_name not in db_products:
+                detail = "Product not found"
+            elif item.product_name in ordered_names:
+                detail = "You already have an active order with this product"
+            elif item.product_name in seen_names:
+                detail = "Product appears more than once in the checkout"
+            elif db_products[item.product_name].stock <= 0:
+                detail = "Product is out of stock"
+            else:
+                detail = None
+            
+            seen_names.add(item.product_name)
+            
+            if detail:
+                errors.append(CheckoutError(index=index, product_name=item.product_name, detail=detail))
+        
+        if errors:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=[error.dict() for error in errors]
+            )
+        
+        order_date = datetime.utcnow()
+        dead_line = order_date + timedelta(days=7)
+        
+        new_orders = [
+            OrderCreate(**item.dict(), order_date=order_date, dead_line=dead_line,
+                        total=db_products[item.product_name].price, user_username=user_username)
+            for item in items
+        ]
+        
+        try:
+            db_orders = self.order_access.add_orders(new_orders=new_orders)
+        except IntegrityError:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="You already have an active order with one of these products"
+            )
+        
+        short_ids = self._reserve_stock(product_ids=[db_products[item.product_name].product_id for item in items])
+        
+        if short_ids:
+            self.db.rollback()
+            errors = []
+            for index, item in enumerate(items):
+                db_product = db_products[item.product_name]
+                if db_product.product_id in short_ids:
+                    product_catalog.mark_sold_out(name=item.product_name, snapshot=db_product)
+                    errors.append(CheckoutError(index=index, product_name=item.product_name,
+                                                detail="Product is out of stock"))
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=[error.dict() for error in errors]
+            )
+        
+        return self.order_access.commit_orders(db_orders=db_orders)
+    
+    def _reserve_stock(self, product_ids: list):
+        """
+        Reserves one unit of each product in the current transaction, returning the ids left short.
+
+        The conditional UPDATE runs in a savepoint. If it updates fewer rows than
+        expected, it is undone and the products are locked to read their stock:
+        the ones at zero are short. If another buyer restocked them in between,
+        the reservation is taken again on the locked rows, where it cannot fail.
+        """
+        
+        savepoint = self.db.begin_nested()
+        
+        if self.product_accesss.reserve_stock(product_ids=product_ids) == len(product_ids):
+            savepoint.commit()
+            return set()
+        
+        savepoint.rollback()
+        
+        stocks = self.product_accesss.lock_stock(product_ids=product_ids)
+        short_ids = {product_id for product_id in product_ids if stocks.get(product_id, 0) <= 0}
+        
+        if not short_ids:
+            self.product_accesss.reserve_stock(product_ids=product_ids)
+        
+        return short_ids
+
+class AsyncOrderService:
+    """
+    Service class for creating orders on an async session, with the same
+    semantics as `OrderService.create_order`.
+
+    Parameters:
+    - `db` (AsyncSession): The SQLAlchemy async database session.
+    """
+    
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Initializes the AsyncOrderService.
+
+        Parameters:
+        - `db` (AsyncSession): The SQLAlchemy async database session.
+        """
+        
+        self.db = db
+        self.order_access = AsyncOrderAccess(db=db)
+        self.product_access = AsyncProductAccess(db=db)
+        
+    async def create_order(self, new_order: OrderBase, user_username: str):
+        """
+        Creates a new order for a user.
+
+        The order is inserted first, so the unique constraint rejects a second
+        order for the same product before the product row is touched; one unit
+        of stock is then reserved and the sales summaries updated in the same
+        transaction.
+
+        Parameters:
+        - `new_order` (OrderBase): The order details.
+        - `user_username` (str): The username of the user placing the order.
+
+        Returns:
+        - The created order.
+
+        Raises:
+        - HTTPException: If the product is not found, the user already has an active order with the product or it is out of stock.
+        """
+        
+        db_product = await product_catalog.get_async(name=new_order.product_name, product_access=self.product_access)
+        
+        if not db_product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
+            )
+            
         order_date = datetime.utcnow()
         dead_line = order_date + timedelta(days=7)
             
         new_order_with_date = OrderCreate(**new_order.dict(), order_date=order_date, dead_line=dead_line, total=db_product.price, user_username=user_username)
         
-        return self.order_access.create_order(new_order=new_order_with_date)
\ No newline at end of file
+        try:
+            db_order = await self.order_access.add_order(new_order=new_order_with_date)
+        except IntegrityError:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="You already have an active order with this product"
+            )
+            
+        if db_product.stock <= 0 or not await self.product_access.reserve_stock(product_ids=[db_product.product_id]):
+            await self.db.rollback()
+            product_catalog.mark_sold_out(name=new_order.product_name, snapshot=db_product)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Product is out of stock"
+            )
+        
+        return await self.order_access.commit_order(db_order=db_order, new_order=new_order_with_date)
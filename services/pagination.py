@@ -0,0 +1,46 @@
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+def encode_cursor(data: dict) -> str:
+    """
+    Encodes the position of the last row of a page into an opaque cursor.
+
+    Parameters:
+    - `data` (dict): JSON-serializable values identifying the last row.
+
+    Returns:
+    - URL-safe cursor string.
+    """
+
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Parameters:
+    - `cursor` (str): The opaque cursor received from the client.
+
+    Returns:
+    - The values identifying the last row of the previous page.
+
+    Raises:
+    - HTTPException: If the cursor is malformed (HTTP 400 Bad Request).
+    """
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        data = None
+
+    if not isinstance(data, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    return data
@@ -1,7 +1,78 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from os import getenv
+from typing import AsyncIterable, Iterable
+
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from data_access.product import ProductAccess
-from schemes.product import ProductCreate
+from data_access.product import AsyncProductAccess, ProductAccess
+from schemes.product import (BulkProductConflict, BulkProductResult, ProductBase, ProductCreate, ProductFilter,
+                             ProductSortField, SortOrder)
+from services.catalog import product_catalog
+from services.conditional import make_etag
+from services.pagination import decode_cursor, encode_cursor
+
+BULK_BATCH_SIZE = int(getenv("BULK_BATCH_SIZE", "1000"))
+
+def parse_product_payload(payload: bytes) -> list:
+    """
+    Parses the JSON array body of a bulk product import.
+
+    Parameters:
+        payload (bytes): The raw request body.
+
+    Returns:
+        list: The decoded rows, still unvalidated.
+
+    Raises:
+        HTTPException: If the payload is not a valid JSON array (HTTP 400 Bad Request).
+    """
+    
+    try:
+        rows = json.loads(payload)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid JSON body"
+        )
+    
+    if not isinstance(rows, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array of products"
+        )
+    
+    return rows
+
+async def iter_ndjson_lines(chunks: AsyncIterable[bytes]):
+    """
+    Splits an NDJSON body into lines as its chunks arrive, skipping blank lines.
+
+    Only the current line is held in memory, never the whole body.
+
+    Parameters:
+        chunks (AsyncIterable[bytes]): The body chunks, such as `request.stream()`.
+
+    Yields:
+        bytes: Each non-blank line, still undecoded.
+    """
+    
+    pending = b""
+    
+    async for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line
+    
+    if pending.strip():
+        yield pending
 
 class ProductService:
     """
@@ -25,7 +96,9 @@ class ProductService:
 
     def create_product(self, new_product: ProductCreate):
         """
-        Create a new product, checking for duplicates.
+        Create a new product, relying on the unique product name to reject duplicates.
+
+        The created product is added to the in-process catalog cache.
 
         Parameters:
             new_product (ProductCreate): Pydantic model representing the product to be created.
@@ -37,22 +110,287 @@ class ProductService:
             HTTPException: If a product with the same name already exists.
         """
         
-        db_product = self.product_access.get_product_by_name(name=new_product.name)
+        try:
+            db_product = self.product_access.create_product(new_product=new_product)
+        except IntegrityError:
+            self.db.rollback()
+        else:
+            product_catalog.put(db_product)
+            return db_product
 
-        if db_product:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Product with the name {new_product.name} already exists"
-            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Product with the name {new_product.name} already exists"
+        )
+    
+    def bulk_create_products(self, rows: Iterable, batch_size: int = BULK_BATCH_SIZE):
+        """
+        Create many products, batch by batch.
+
+        Each batch costs one SELECT to find names that already exist and one
+        executemany INSERT followed by a commit. Rows that fail validation or whose
+        name already exists, in the database or earlier in the payload, are skipped
+        and reported in input row order.
 
-        return self.product_access.create_product(new_product=new_product)
+        Parameters:
+            rows (Iterable): Unvalidated product rows (dicts from JSON, NDJSON or CSV).
+            batch_size (int): Number of rows checked and inserted per batch.
+
+        Returns:
+            BulkProductResult: The number of products created and the rejected rows, by row number.
+        """
+        
+        created = 0
+        conflicts = []
+        batch = []
+        
+        for row_number, row in enumerate(rows, start=1):
+            product = self._validate_row(row_number=row_number, row=row, conflicts=conflicts)
+            if product is None:
+                continue
+            
+            batch.append((row_number, product))
+            if len(batch) >= batch_size:
+                created += self._create_batch(batch=batch, conflicts=conflicts)
+                batch = []
+        
+        if batch:
+            created += self._create_batch(batch=batch, conflicts=conflicts)
+        
+        conflicts.sort(key=lambda conflict: conflict.row)
+        
+        return BulkProductResult(created=created, conflicts=conflicts)
     
-    def get_products(self):
+    async def bulk_create_products_from_lines(self, lines: AsyncIterable[bytes], batch_size: int = BULK_BATCH_SIZE):
         """
-        Retrieve all products from the database.
+        Create many products from NDJSON lines read as the body arrives.
+
+        Works like `bulk_create_products`, except that each line is decoded on
+        its own and a line that is not valid JSON is reported as a rejected row.
+        Only the current batch is held in memory; each batch is inserted in the
+        threadpool, as the session is synchronous.
+
+        Parameters:
+            lines (AsyncIterable[bytes]): The non-blank NDJSON lines, one product per line.
+            batch_size (int): Number of rows checked and inserted per batch.
 
         Returns:
-            List[Product]: A list of products retrieved from the database.
+            BulkProductResult: The number of products created and the rejected rows, by row number.
         """
         
-        return self.product_access.get_products()
+        created = 0
+        conflicts = []
+        batch = []
+        row_number = 0
+        
+        async for line in lines:
+            row_number += 1
+            try:
+                row = json.loads(line)
+            except ValueError:
+                conflicts.append(BulkProductConflict(row=row_number, name=None, detail="Invalid JSON"))
+                continue
+            
+            product = self._validate_row(row_number=row_number, row=row, conflicts=conflicts)
+            if product is None:
+                continue
+            
+            batch.append((row_number, product))
+            if len(batch) >= batch_size:
+                created += await run_in_threadpool(self._create_batch, batch=batch, conflicts=conflicts)
+                batch = []
+        
+        if batch:
+            created += await run_in_threadpool(self._create_batch, batch=batch, conflicts=conflicts)
+        
+        conflicts.sort(key=lambda conflict: conflict.row)
+        
+        return BulkProductResult(created=created, conflicts=conflicts)
+    
+    def _validate_row(self, row_number: int, row, conflicts: list):
+        """
+        Validates one bulk row, recording a conflict and returning None if it is invalid.
+        """
+        
+        try:
+            return ProductBase.parse_obj(row)
+        except ValidationError as error:
+            name = row.get("name") if isinstance(row, dict) else None
+            detail = "; ".join(f"{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in error.errors())
+            conflicts.append(BulkProductConflict(row=row_number, name=name, detail=detail))
+            return None
+    
+    def _create_batch(self, batch: list, conflicts: list, retry: bool = True):
+        """
+        Inserts the rows of one batch whose names are not taken, returning how many were inserted.
+
+        If a concurrent writer takes one of the names between the lookup and the
+        insert, the unique constraint rejects the batch and it is checked again once.
+        If the second insert is rejected too, its rows are reported as conflicts.
+        """
+        
+        taken = self.product_access.get_existing_names(names={product.name for _, product in batch})
+        created_date = datetime.utcnow()
+        new_rows = []
+        batch_conflicts = []
+        
+        for row_number, product in batch:
+            if product.name in taken:
+                batch_conflicts.append(BulkProductConflict(
+                    row=row_number,
+                    name=product.name,
+                    detail=f"Product with the name {product.name} already exists"
+                ))
+                continue
+            
+            taken.add(product.name)
+            new_rows.append((row_number, product))
+        
+        try:
+            self.product_access.bulk_create_products(new_products=[
+                ProductCreate(**product.dict(), created_date=created_date) for _, product in new_rows
+            ])
+        except IntegrityError:
+            self.db.rollback()
+            if retry:
+                return self._create_batch(batch=batch, conflicts=conflicts, retry=False)
+            
+            conflicts.extend(batch_conflicts)
+            conflicts.extend(BulkProductConflict(
+                row=row_number,
+                name=product.name,
+                detail="Batch rejected because products with the same names were created concurrently"
+            ) for row_number, product in new_rows)
+            return 0
+        
+        conflicts.extend(batch_conflicts)
+        
+        return len(new_rows)
+    
+    def get_products_etag(self, variant: str):
+        """
+        Compute the ETag of a product listing without loading any product.
+
+        Parameters:
+            variant (str): What distinguishes this listing, such as its query string.
+
+        Returns:
+            str: A strong ETag.
+        """
+        
+        return make_etag("products", variant, self.product_access.get_catalog_version())
+    
+    def get_products(self, filters: ProductFilter, sort_by: ProductSortField = ProductSortField.product_id,
+                     order: SortOrder = SortOrder.asc, limit: int = 50, cursor: str | None = None):
+        """
+        Retrieve one page of products.
+
+        Parameters:
+            filters (ProductFilter): Server-side filters on price, stock and creation date.
+            sort_by (ProductSortField): Column used to sort the products.
+            order (SortOrder): Sort direction.
+            limit (int): Maximum number of products in the page.
+            cursor (str | None): Cursor returned with the previous page, None for the first page.
+
+        Returns:
+            dict: Shaped like ProductPage, with the products of the page as column
+            dicts and the cursor of the next one.
+
+        Raises:
+            HTTPException: If the cursor is invalid or was issued for a different sort.
+        """
+        
+        after = None
+        
+        if cursor:
+            data = decode_cursor(cursor)
+            if data.get("sort") != sort_by.value or data.get("order") != order.value:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor does not match the requested sort"
+                )
+            try:
+                after = (self._parse_sort_value(sort_by, data["value"]), int(data["id"]))
+            except (KeyError, TypeError, ValueError, ArithmeticError):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+        
+        products = self.product_access.get_products(filters=filters, sort_by=sort_by, order=order,
+                                                    limit=limit + 1, after=after)
+        
+        next_cursor = None
+        
+        if len(products) > limit:
+            products = products[:limit]
+            last = products[-1]
+            next_cursor = encode_cursor({
+                "sort": sort_by.value,
+                "order": order.value,
+                "value": last[sort_by.value],
+                "id": last["product_id"]
+            })
+        
+        return {"items": products, "next_cursor": next_cursor}
+    
+    @staticmethod
+    def _parse_sort_value(sort_by: ProductSortField, value):
+        """
+        Converts a sort value read from a cursor back to the column type.
+        """
+        
+        if sort_by == ProductSortField.price:
+            return Decimal(value)
+        if sort_by == ProductSortField.created_date:
+            return datetime.fromisoformat(value)
+        return int(value)
+
+class AsyncProductService:
+    """
+    Service class for product-related operations on an async database session.
+
+    Attributes:
+        db (AsyncSession): The SQLAlchemy async database session.
+        product_access (AsyncProductAccess): Instance of AsyncProductAccess for database operations.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """
+        Initialize AsyncProductService with an async database session.
+
+        Parameters:
+            db (AsyncSession): The SQLAlchemy async database session.
+        """
+        
+        self.db = db
+        self.product_access = AsyncProductAccess(db=db)
+
+    async def create_product(self, new_product: ProductCreate):
+        """
+        Create a new product, relying on the unique product name to reject duplicates.
+
+        The created product is added to the in-process catalog cache.
+
+        Parameters:
+            new_product (ProductCreate): Pydantic model representing the product to be created.
+
+        Returns:
+            Product: The created product.
+
+        Raises:
+            HTTPException: If a product with the same name already exists.
+        """
+        
+        try:
+            db_product = await self.product_access.create_product(new_product=new_product)
+        except IntegrityError:
+            await self.db.rollback()
+        else:
+            product_catalog.put(db_product)
+            return db_product
+
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Product with the name {new_product.name} already exists"
+        )
@@ -0,0 +1,171 @@
+import hmac
+import logging
+import os
+import random
+import sys
+from collections import Counter
+from datetime import datetime
+from os import getenv
+from threading import Event, Thread, get_ident
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PROFILING_ENABLED = getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILING_KEY = getenv("PROFILING_KEY", "")
+PROFILING_SAMPLE_RATE = float(getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL_MS = float(getenv("PROFILING_INTERVAL_MS", "2"))
+PROFILING_DIR = getenv("PROFILING_DIR", "profiles")
+
+PROFILE_HEADER = b"x-profile"
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class StackSampler(Thread):
+    """
+    Background thread that samples the stacks of the other threads at a fixed interval.
+
+    Only stacks running at least one frame of the project are kept, which drops
+    idle workers and the event loop waiting for I/O. Sync routes run in a
+    thread pool, so sampling every thread, rather than profiling the calling
+    one, is what makes them visible.
+
+    Attributes:
+        interval (float): Seconds between two samples.
+        stacks (Counter): Number of samples per folded stack, root frame first.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """
+        Initializes the sampler; call `start` to begin sampling.
+
+        Parameters:
+        - `interval` (float): Seconds between two samples.
+        """
+
+        super().__init__(name="request-profiler", daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._labels = {}
+        self._stopped = Event()
+
+    def _label(self, code):
+        label = self._labels.get(code)
+
+        if label is None:
+            in_project = code.co_filename.startswith(PROJECT_ROOT)
+            filename = os.path.relpath(code.co_filename, PROJECT_ROOT) if in_project else os.path.basename(code.co_filename)
+            label = self._labels[code] = (f"{filename}:{code.co_name}", in_project)
+
+        return label
+
+    def run(self) -> None:
+        own_ident = get_ident()
+
+        while not self._stopped.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                in_project = False
+                while frame is not None:
+                    label, project_frame = self._label(frame.f_code)
+                    stack.append(label)
+                    in_project = in_project or project_frame
+                    frame = frame.f_back
+                if in_project:
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        """
+        Stops sampling and returns the collected stacks.
+        """
+
+        self._stopped.set()
+        self.join()
+        return self.stacks
+
+def profile_path(directory: str, method: str, path: str) -> str:
+    """
+    Returns a unique file name for the profile of a request, creating `directory` if missing.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    slug = path.strip("/").replace("/", "_") or "root"
+    return os.path.join(directory, f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{method}-{slug}.folded")
+
+def write_folded(stacks: Counter, filename: str) -> None:
+    """
+    Writes stacks in the folded format read by flamegraph.pl and speedscope.
+
+    Parameters:
+    - `stacks` (Counter): Number of samples per folded stack.
+    - `filename` (str): The file to write.
+    """
+
+    with open(filename, "w") as file:
+        file.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware that profiles selected requests with a `StackSampler`.
+
+    A request is profiled when its `X-Profile` header matches `key`, or at
+    random with probability `sample_rate`. The profile is written as a folded
+    stacks file and its name returned in the `X-Profile` response header.
+    Other requests only pay for the header check. Requests served while a
+    profile runs may appear in it, so profile on a quiet worker.
+    """
+
+    def __init__(self, app, directory: str, key: str = "", sample_rate: float = 0.0,
+                 interval: float = 0.002) -> None:
+        """
+        Wraps an ASGI application.
+
+        Parameters:
+        - `app`: The wrapped application.
+        - `directory` (str): Folder the profiles are written to.
+        - `key` (str): Value of the `X-Profile` header that requests a profile; empty disables the header.
+        - `sample_rate` (float): Fraction of requests profiled at random.
+        - `interval` (float): Seconds between two samples.
+        """
+
+        self.app = app
+        self.directory = directory
+        self.key = key.encode()
+        self.sample_rate = sample_rate
+        self.interval = interval
+
+    def _wants_profile(self, scope) -> bool:
+        if self.key:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value, self.key)
+
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(interval=self.interval)
+        filename = profile_path(self.directory, scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (PROFILE_HEADER, os.path.basename(filename).encode())]
+            await send(message)
+
+        sampler.start()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stacks = sampler.stop()
+            write_folded(stacks, filename)
+            logger.info("Profiled %s %s: %d samples written to %s",
+                        scope["method"], scope["path"], sum(stacks.values()), filename)
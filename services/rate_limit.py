@@ -0,0 +1,161 @@
+from collections import OrderedDict
+from math import ceil
+from os import getenv
+from threading import Lock
+from time import monotonic
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request, status
+
+load_dotenv()
+
+RATE_LIMIT_ENABLED = getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+RATE_LIMIT_MAX_KEYS = int(getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+class TokenBucketLimiter:
+    """
+    Thread-safe token bucket limiter with one bucket per key.
+
+    Each bucket holds up to `capacity` tokens and regains `capacity` tokens
+    every `period` seconds; a request takes one token. Buckets live in an LRU
+    ordered dict capped at `maxsize`: a check is O(1), and when the dict is
+    full the least recently seen key is dropped. An idle key would have
+    refilled anyway, so dropping it loses nothing.
+
+    Attributes:
+        name (str): Label of the limiter in metrics.
+        capacity (int): Requests allowed in a burst.
+        period (float): Seconds to refill a whole bucket.
+        maxsize (int): Maximum number of keys tracked.
+        rejected (int): Requests rejected since startup.
+    """
+
+    def __init__(self, name: str, capacity: int, period: float, maxsize: int) -> None:
+        """
+        Initializes an empty limiter.
+
+        Parameters:
+        - `name` (str): Label of the limiter in metrics.
+        - `capacity` (int): Requests allowed in a burst.
+        - `period` (float): Seconds to refill a whole bucket.
+        - `maxsize` (int): Maximum number of keys tracked.
+        """
+
+        self.name = name
+        self.capacity = capacity
+        self.period = period
+        self.maxsize = maxsize
+        self.rejected = 0
+        self._rate = capacity / period
+        self._buckets = OrderedDict()
+        self._lock = Lock()
+
+    def hit(self, key) -> float:
+        """
+        Takes one token from the bucket of `key`.
+
+        Returns:
+        - 0 if the request is allowed, otherwise the seconds until a token is available.
+        """
+
+        now = monotonic()
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                tokens = self.capacity
+            else:
+                tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self._rate)
+                self._buckets.move_to_end(key)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                wait = 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                self.rejected += 1
+                wait = (1 - tokens) / self._rate
+
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+            return wait
+
+    def refund(self, key) -> None:
+        """
+        Gives back the token taken from the bucket of `key` by a request another limiter rejected.
+        """
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                self._buckets[key] = (min(self.capacity, bucket[0] + 1), bucket[1])
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+def _limiter(name: str, variable: str, default: str) -> TokenBucketLimiter:
+    """
+    Builds a limiter from an environment variable formatted as `requests/seconds`.
+    """
+
+    capacity, period = getenv(variable, default).split("/")
+    return TokenBucketLimiter(name=name, capacity=int(capacity), period=float(period), maxsize=RATE_LIMIT_MAX_KEYS)
+
+login_ip_limiter = _limiter("login_ip", "RATE_LIMIT_LOGIN_IP", "20/60")
+login_user_limiter = _limiter("login_user", "RATE_LIMIT_LOGIN_USER", "5/60")
+order_ip_limiter = _limiter("order_ip", "RATE_LIMIT_ORDERS_IP", "120/60")
+order_user_limiter = _limiter("order_user", "RATE_LIMIT_ORDERS_USER", "30/60")
+
+limiters = (login_ip_limiter, login_user_limiter, order_ip_limiter, order_user_limiter)
+
+def client_ip(request: Request) -> str:
+    """
+    Returns the address of the peer; behind a proxy, run uvicorn with
+    `--proxy-headers` so it is the client's address.
+    """
+
+    return request.client.host if request.client else "unknown"
+
+def enforce_limits(*checks) -> None:
+    """
+    Takes a token from every `(limiter, key)` pair in turn, rejecting the request at the first empty bucket.
+
+    The buckets checked before the rejecting one get their token back and the
+    ones after it are not touched, so a request rejected for its address does
+    not drain the bucket of its user.
+
+    Raises:
+    - HTTPException with 429 status and a `Retry-After` header.
+    """
+
+    if not RATE_LIMIT_ENABLED:
+        return
+
+    for index, (limiter, key) in enumerate(checks):
+        wait = limiter.hit(key)
+        if not wait:
+            continue
+
+        for passed_limiter, passed_key in checks[:index]:
+            passed_limiter.refund(passed_key)
+
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": str(ceil(wait))},
+        )
+
+def prometheus_lines() -> list:
+    """
+    Renders the rejection counters and tracked keys of every limiter.
+    """
+
+    lines = ["# HELP rate_limit_rejected_total Requests rejected by a rate limiter.",
+             "# TYPE rate_limit_rejected_total counter"]
+    lines += [f'rate_limit_rejected_total{{limiter="{limiter.name}"}} {limiter.rejected}' for limiter in limiters]
+    lines += ["# HELP rate_limit_keys Keys currently tracked by a rate limiter.",
+              "# TYPE rate_limit_keys gauge"]
+    lines += [f'rate_limit_keys{{limiter="{limiter.name}"}} {len(limiter)}' for limiter in limiters]
+    return lines
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from os import getenv
+from time import perf_counter
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+WARMUP_RETRY_INTERVAL = float(getenv("DB_WARMUP_RETRY_INTERVAL", "2"))
+
+class Readiness:
+    """
+    Startup milestones of the worker, served by the readiness endpoint.
+
+    Attributes:
+        ready (bool): Whether both pools hold a connection that answered a ping.
+        startup_ms (float | None): Time from importing `main` to the end of the startup handlers.
+        warmup_ms (float | None): Time from importing `main` to `ready`.
+        last_error (str | None): Last error of the connection warmup, cleared once ready.
+    """
+
+    def __init__(self) -> None:
+        """
+        Starts the clock; created when `main` is imported.
+        """
+
+        self.started_at = perf_counter()
+        self.ready = False
+        self.startup_ms = None
+        self.warmup_ms = None
+        self.last_error = None
+
+    def _elapsed_ms(self) -> float:
+        return round((perf_counter() - self.started_at) * 1000, 3)
+
+    def mark_started(self) -> None:
+        """
+        Records the end of the startup handlers.
+        """
+
+        self.startup_ms = self._elapsed_ms()
+        logger.info("Worker started in %.1f ms", self.startup_ms)
+
+    def mark_ready(self) -> None:
+        """
+        Records that the pools are warm.
+        """
+
+        self.warmup_ms = self._elapsed_ms()
+        self.ready = True
+        self.last_error = None
+        logger.info("Worker ready in %.1f ms", self.warmup_ms)
+
+    def status(self) -> dict:
+        """
+        Returns the milestones as a dict shaped like ReadinessStatus.
+        """
+
+        return {"ready": self.ready, "startup_ms": self.startup_ms, "warmup_ms": self.warmup_ms,
+                "error": self.last_error}
+
+def _ping(engine) -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+async def warm_pools(engine, async_engine, readiness: Readiness, retry_interval: float = WARMUP_RETRY_INTERVAL) -> None:
+    """
+    Opens and pings one connection of each engine, retrying until the database answers.
+
+    The connections go back to their pools, so the first requests do not pay
+    for the connection setup. Marks `readiness` as ready on success.
+
+    Parameters:
+    - `engine`: The sync engine.
+    - `async_engine`: The async engine.
+    - `readiness` (Readiness): Milestones to update.
+    - `retry_interval` (float): Seconds between two attempts.
+    """
+
+    while True:
+        try:
+            await run_in_threadpool(_ping, engine)
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        except (SQLAlchemyError, OSError) as error:
+            readiness.last_error = str(error).splitlines()[0]
+            logger.warning("Database not reachable, retrying in %.1f s: %s", retry_interval, readiness.last_error)
+            await asyncio.sleep(retry_interval)
+        else:
+            readiness.mark_ready()
+            return
+
+readiness = Readiness()
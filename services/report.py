@@ -0,0 +1,59 @@
+from datetime import date
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from data_access.summary import SummaryAccess
+
+class ReportService:
+    """
+    Service class for the sales reports, read from the summary tables.
+
+    Parameters:
+    - `db` (Session): The SQLAlchemy database session.
+    """
+    
+    def __init__(self, db: Session) -> None:
+        """
+        Initializes the ReportService.
+
+        Parameters:
+        - `db` (Session): The SQLAlchemy database session.
+        """
+        
+        self.summary_access = SummaryAccess(db=db)
+        
+    def get_product_sales(self, limit: int = 50):
+        """
+        Retrieves the best selling products by revenue.
+
+        Parameters:
+        - `limit` (int): Maximum number of products to return.
+
+        Returns:
+        - Sales rows, highest revenue first.
+        """
+        
+        return self.summary_access.get_product_sales(limit=limit)
+    
+    def get_daily_revenue(self, date_from: date, date_to: date):
+        """
+        Retrieves the revenue per day in a date range.
+
+        Parameters:
+        - `date_from` (date): First day of the range.
+        - `date_to` (date): Last day of the range.
+
+        Returns:
+        - Revenue rows of the days with orders, oldest day first.
+
+        Raises:
+        - HTTPException: 400 if `date_from` is after `date_to`.
+        """
+        
+        if date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="date_from must not be after date_to"
+            )
+        
+        return self.summary_access.get_daily_revenue(date_from=date_from, date_to=date_to)
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from datetime import datetime
+from os import getenv
+from threading import Lock
+from time import perf_counter
+
+from dotenv import load_dotenv
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from data_access.order import OrderAccess
+from database.config import SessionLocal
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ORDER_SCHEDULER_ENABLED = getenv("ORDER_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+ORDER_SCHEDULER_INTERVAL = float(getenv("ORDER_SCHEDULER_INTERVAL", "60"))
+ORDER_SCHEDULER_BATCH_SIZE = int(getenv("ORDER_SCHEDULER_BATCH_SIZE", "500"))
+ORDER_SCHEDULER_MAX_BATCHES = int(getenv("ORDER_SCHEDULER_MAX_BATCHES", "100"))
+
+ORDER_STATUS_TRANSITIONS = {"On the way": "Delivered"}
+
+class OrderStatusScheduler:
+    """
+    Periodic in-process worker that advances overdue orders to their next status.
+
+    Every run walks `ORDER_STATUS_TRANSITIONS` and, for each status, updates
+    overdue orders `batch_size` at a time, committing after every batch so no
+    lock is held for long. A run stops after `max_batches` batches; the rest
+    is picked up by the next run. Every worker may run the scheduler: the
+    updates only apply to orders still in the source status.
+
+    Attributes:
+        interval (float): Seconds between the end of a run and the next one.
+        batch_size (int): Orders updated per statement and commit.
+        max_batches (int): Maximum number of batches per run.
+        runs (int): Completed runs since startup.
+        failed_runs (int): Runs aborted by an error.
+        rows (dict): Orders moved since startup, per transition.
+        last_run_rows (int): Orders moved by the last run.
+        last_run_seconds (float): Duration of the last run.
+        last_run_at (datetime | None): When the last run finished.
+    """
+
+    def __init__(self, session_factory, interval: float, batch_size: int, max_batches: int) -> None:
+        """
+        Initializes the scheduler; call `start` to run it.
+
+        Parameters:
+        - `session_factory`: Callable returning a new sync Session.
+        - `interval` (float): Seconds between two runs.
+        - `batch_size` (int): Orders updated per statement and commit.
+        - `max_batches` (int): Maximum number of batches per run.
+        """
+
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.runs = 0
+        self.failed_runs = 0
+        self.rows = {f"{source} -> {target}": 0 for source, target in ORDER_STATUS_TRANSITIONS.items()}
+        self.last_run_rows = 0
+        self.last_run_seconds = 0.0
+        self.last_run_at = None
+        self._lock = Lock()
+        self._task = None
+
+    def run_once(self) -> int:
+        """
+        Advances the overdue orders, in batches, from a worker thread.
+
+        Returns:
+        - The number of orders moved.
+        """
+
+        start = perf_counter()
+        now = datetime.utcnow()
+        moved = {}
+        batches = 0
+        db = self.session_factory()
+
+        try:
+            order_access = OrderAccess(db=db)
+            for source, target in ORDER_STATUS_TRANSITIONS.items():
+                key = f"{source} -> {target}"
+                moved[key] = 0
+                while batches < self.max_batches:
+                    order_ids = order_access.get_overdue_order_ids(order_status=source, now=now, limit=self.batch_size)
+                    if not order_ids:
+                        break
+                    moved[key] += order_access.update_status(order_ids=order_ids, from_status=source, to_status=target)
+                    batches += 1
+                    if len(order_ids) < self.batch_size:
+                        break
+        finally:
+            db.close()
+            with self._lock:
+                for key, count in moved.items():
+                    self.rows[key] += count
+                self.last_run_rows = sum(moved.values())
+                self.last_run_seconds = perf_counter() - start
+                self.last_run_at = datetime.utcnow()
+
+        if self.last_run_rows:
+            logger.info("Order scheduler moved %d orders in %d batches (%.1f ms)",
+                        self.last_run_rows, batches, self.last_run_seconds * 1000)
+
+        return self.last_run_rows
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.run_once)
+                self.runs += 1
+            except SQLAlchemyError:
+                self.failed_runs += 1
+                logger.warning("Order scheduler run failed, retrying in %.1f s", self.interval, exc_info=True)
+            except Exception:
+                self.failed_runs += 1
+                logger.exception("Order scheduler run crashed, retrying in %.1f s", self.interval)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """
+        Starts the periodic runs on the running event loop.
+        """
+
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """
+        Cancels the periodic runs; a batch already running finishes in its thread.
+        """
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        """
+        Returns the configuration and counters of the scheduler.
+        """
+
+        with self._lock:
+            return {
+                "enabled": self._task is not None,
+                "interval": self.interval,
+                "batch_size": self.batch_size,
+                "max_batches": self.max_batches,
+                "runs": self.runs,
+                "failed_runs": self.failed_runs,
+                "rows": dict(self.rows),
+                "last_run_rows": self.last_run_rows,
+                "last_run_seconds": round(self.last_run_seconds, 6),
+                "last_run_at": self.last_run_at,
+            }
+
+    def prometheus_lines(self) -> list:
+        """
+        Renders the counters in the Prometheus text exposition format.
+        """
+
+        stats = self.stats()
+        lines = [
+            "# HELP order_scheduler_runs_total Completed scheduler runs.",
+            "# TYPE order_scheduler_runs_total counter",
+            f"order_scheduler_runs_total {stats['runs']}",
+            "# HELP order_scheduler_failed_runs_total Scheduler runs aborted by an error.",
+            "# TYPE order_scheduler_failed_runs_total counter",
+            f"order_scheduler_failed_runs_total {stats['failed_runs']}",
+            "# HELP order_scheduler_rows_total Orders moved to their next status.",
+            "# TYPE order_scheduler_rows_total counter",
+        ]
+        lines += [f'order_scheduler_rows_total{{transition="{transition}"}} {count}'
+                  for transition, count in stats["rows"].items()]
+        lines += [
+            "# HELP order_scheduler_last_run_rows Orders moved by the last run.",
+            "# TYPE order_scheduler_last_run_rows gauge",
+            f"order_scheduler_last_run_rows {stats['last_run_rows']}",
+            "# HELP order_scheduler_last_run_seconds Duration of the last run.",
+            "# TYPE order_scheduler_last_run_seconds gauge",
+            f"order_scheduler_last_run_seconds {stats['last_run_seconds']}",
+        ]
+        return lines
+
+order_scheduler = OrderStatusScheduler(
+    session_factory=SessionLocal,
+    interval=ORDER_SCHEDULER_INTERVAL,
+    batch_size=ORDER_SCHEDULER_BATCH_SIZE,
+    max_batches=ORDER_SCHEDULER_MAX_BATCHES,
+)
@@ -0,0 +1,50 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value):
+    """
+    Encodes the column types the JSON encoders do not handle natively.
+    """
+
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content) -> bytes:
+    """
+    Encodes plain dicts, lists and column values to JSON bytes.
+
+    Uses orjson when it is installed and the standard library otherwise.
+
+    Parameters:
+    - `content`: The value to encode.
+
+    Returns:
+    - The encoded JSON document.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that skips pydantic validation and encodes rows directly.
+
+    Routes returning it hand over plain dicts built from column-only queries,
+    so no ORM object or response model is created per row.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
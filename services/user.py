@@ -1,14 +1,56 @@
+from datetime import datetime
+
 from fastapi import HTTPException, Depends, status
 from schemes.user import UserCreate
-from data_access.user import UserAccess
+from data_access.user import AsyncUserAccess, UserAccess
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from database.get_db import get_db
+from schemes.order import OrderFilter, OrderWithProduct
+from services.conditional import make_etag
+from services.hashing import password_hasher
+from services.pagination import decode_cursor, encode_cursor
+
+def _decode_orders_cursor(cursor: str | None):
+    """
+    Turns an order history cursor back into `(order_date, order_id)`, or None for the first page.
+    """
+    
+    if not cursor:
+        return None
+    
+    data = decode_cursor(cursor)
+    
+    try:
+        return datetime.fromisoformat(data["date"]), int(data["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def _orders_page(orders: list, limit: int):
+    """
+    Builds a dict shaped like OrderPage from up to `limit + 1` order rows, the
+    extra one signalling a next page.
+    """
+    
+    next_cursor = None
+    
+    if len(orders) > limit:
+        orders = orders[:limit]
+        last = orders[-1]
+        next_cursor = encode_cursor({"date": last["order_date"].isoformat(), "id": last["order_id"]})
+    
+    return {"items": orders, "next_cursor": next_cursor}
 
 class UserService:
     """
     Class that encapsulates business logic related to users.
 
     Attributes:
+        db (Session): The database session.
         user_access (UserAccess): Object providing access to user-related database operations.
     """
     
@@ -20,12 +62,17 @@ class UserService:
             db (Session): The database session.
         """
         
+        self.db = db
         self.user_access = UserAccess(db=db)
         
     def create_user(self, new_user: UserCreate):
         """
         Creates a new user if no user with the same username or email already exists.
 
+        The insert is attempted directly and the unique constraints on username and
+        email reject duplicates; only a rejected insert costs an extra lookup to
+        report which field clashed.
+
         Parameters:
             new_user (UserCreate): Data for the new user to be created.
 
@@ -36,46 +83,125 @@ class UserService:
             HTTPException: If a user with the same username or email already exists.
         """
         
-        user = self.user_access.get_user_by_username(username=new_user.username)
-        if user:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Username already exists"
-            )
-            
-        user = self.user_access.get_user_by_email(email=new_user.email)
-        if user:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Email already exists"
-            )
-            
         new_user.email = new_user.email.lower()
-            
-        db_user = self.user_access.create_user(user=new_user)
-        return db_user
+        new_user.password = password_hasher.hash_sync(new_user.password)
+        
+        try:
+            return self.user_access.create_user(user=new_user)
+        except IntegrityError:
+            self.db.rollback()
+        
+        if self.user_access.get_user_by_username(username=new_user.username):
+            detail = "Username already exists"
+        else:
+            detail = "Email already exists"
+        
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail
+        )
     
-    async def get_orders(self, username: str):
+    def get_orders(self, username: str, filters: OrderFilter, limit: int = 50, cursor: str | None = None):
         """
-        Retrieves the orders associated with a user.
+        Retrieves one page of the orders associated with a user, newest first.
 
         Parameters:
-            - `username` (str): The username of the user.
+            - `username` (str): The username of the authenticated user; the token already
+              identifies it, so no user row is read.
+            - `filters` (OrderFilter): Filters on status and order date.
+            - `limit` (int): Maximum number of orders in the page.
+            - `cursor` (str | None): Cursor returned with the previous page, None for the first page.
+
+        Returns:
+            - Dict shaped like OrderPage with the orders of the page and the cursor of the next one.
+
+        Raises:
+            - HTTPException: If the cursor is invalid (HTTP 400 Bad Request).
+        """
+        
+        orders = self.user_access.get_orders(user_username=username, filters=filters, limit=limit + 1,
+                                             after=_decode_orders_cursor(cursor))
+        
+        return _orders_page(orders=orders, limit=limit)
+
+class AsyncUserService:
+    """
+    Class that encapsulates user business logic on an async database session.
+
+    Attributes:
+        user_access (AsyncUserAccess): Object providing async access to user-related database operations.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        """
+        Initializes the service with an async database session.
+
+        Parameters:
+            db (AsyncSession): The async database session.
+        """
+        
+        self.user_access = AsyncUserAccess(db=db)
+    
+    async def get_orders(self, username: str, filters: OrderFilter, limit: int = 50, cursor: str | None = None):
+        """
+        Retrieves one page of the orders associated with a user, newest first.
+
+        Parameters:
+            - `username` (str): The username of the authenticated user; the token already
+              identifies it, so no user row is read.
+            - `filters` (OrderFilter): Filters on status and order date.
+            - `limit` (int): Maximum number of orders in the page.
+            - `cursor` (str | None): Cursor returned with the previous page, None for the first page.
+
+        Returns:
+            - Dict shaped like OrderPage with the orders of the page and the cursor of the next one.
+
+        Raises:
+            - HTTPException: If the cursor is invalid (HTTP 400 Bad Request).
+        """
+        
+        orders = await self.user_access.get_orders(user_username=username, filters=filters, limit=limit + 1,
+                                                    after=_decode_orders_cursor(cursor))
+        
+        return _orders_page(orders=orders, limit=limit)
+    
+    async def get_orders_with_products(self, username: str, filters: OrderFilter, limit: int = 50,
+                                       cursor: str | None = None):
+        """
+        Retrieves one page of a user's orders with their products embedded, newest first.
+
+        Parameters:
+            - `username` (str): The username of the authenticated user; the token already
+              identifies it, so no user row is read.
+            - `filters` (OrderFilter): Filters on status and order date.
+            - `limit` (int): Maximum number of orders in the page.
+            - `cursor` (str | None): Cursor returned with the previous page, None for the first page.
 
         Returns:
-            - A list of orders associated with the user.
+            - Dict shaped like OrderWithProductPage with the orders of the page and the cursor of the next one.
 
         Raises:
-            - HTTPException: If the user with the specified username is not found (HTTP 404 Not Found).
+            - HTTPException: If the cursor is invalid (HTTP 400 Bad Request).
         """
         
-        db_user = self.user_access.get_user_by_username(username=username)
+        db_orders = await self.user_access.get_orders_with_products(user_username=username, filters=filters,
+                                                                    limit=limit + 1,
+                                                                    after=_decode_orders_cursor(cursor))
+        orders = [OrderWithProduct.from_orm(db_order).dict() for db_order in db_orders]
+        
+        return _orders_page(orders=orders, limit=limit)
+    
+    async def get_orders_etag(self, username: str, variant: str):
+        """
+        Computes the ETag of a user's order history without loading any order.
+
+        Parameters:
+            - `username` (str): The username of the user.
+            - `variant` (str): What distinguishes this listing, such as its query string.
+
+        Returns:
+            - A strong ETag.
+        """
         
-        if not db_user:
-            
-            return HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-            
-        return await self.user_access.get_orders(user_username=username)
\ No newline at end of file
+        version = await self.user_access.get_orders_version(user_username=username)
+        return make_etag("orders", username, variant, version)
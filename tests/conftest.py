@@ -0,0 +1,16 @@
+"""
+Points the application at a throwaway SQLite file before any test imports it.
+
+The async engine uses the same file through aiosqlite.
+"""
+
+import os
+import tempfile
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="apirest-test-"), "test.db")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["ORDER_SCHEDULER_ENABLED"] = "false"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
@@ -0,0 +1,94 @@
+"""
+Tests of the async order path against aiosqlite.
+
+`AsyncOrderService.create_order` must behave like the sync path: the unique
+constraint rejects duplicates before any stock is taken, the stock is reserved
+with the conditional UPDATE, and the sales summaries and catalog version are
+updated in the same transaction.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+import models
+from database.config import AsyncSessionLocal, SessionLocal, async_engine, engine
+from models.order import Order
+from models.product import CatalogVersion, Product
+from models.summary import ProductSales
+from models.user import User
+from schemes.order import OrderBase
+from services.catalog import product_catalog
+from services.order import AsyncOrderService
+
+@pytest.fixture(autouse=True)
+def database():
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    product_catalog.cache.clear()
+
+    db = SessionLocal()
+    try:
+        db.add_all([User(username=username, password="hash", email=f"{username}@example.com",
+                         name=username, address="Test Street") for username in ("ann", "ben")])
+        db.add(Product(name="lamp", description="Lamp", price=25, stock=1, created_date=datetime.utcnow()))
+        db.commit()
+    finally:
+        db.close()
+
+def create_order(username: str, product_name: str = "lamp"):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            order_service = AsyncOrderService(db=db)
+            return await order_service.create_order(new_order=OrderBase(product_name=product_name, notes=None),
+                                                    user_username=username)
+
+    return asyncio.run(run())
+
+def scalar(statement):
+    db = SessionLocal()
+    try:
+        return db.execute(statement).scalar()
+    finally:
+        db.close()
+
+def test_runs_on_aiosqlite():
+    assert async_engine.dialect.driver == "aiosqlite"
+
+def test_create_order_reserves_stock_and_updates_summaries():
+    order = create_order("ann")
+
+    assert order.user_username == "ann"
+    assert scalar(select(Product.stock).where(Product.name == "lamp")) == 0
+    assert scalar(select(ProductSales.orders_count).where(ProductSales.product_name == "lamp")) == 1
+    assert scalar(select(func.sum(CatalogVersion.version))) == 1
+
+def test_duplicate_order_is_rejected_before_stock_check():
+    create_order("ann")
+
+    with pytest.raises(HTTPException) as error:
+        create_order("ann")
+
+    assert error.value.status_code == 409
+    assert error.value.detail == "You already have an active order with this product"
+    assert scalar(select(func.count()).select_from(Order)) == 1
+
+def test_out_of_stock_rolls_the_order_back():
+    create_order("ann")
+    product_catalog.cache.clear()
+
+    with pytest.raises(HTTPException) as error:
+        create_order("ben")
+
+    assert error.value.detail == "Product is out of stock"
+    assert scalar(select(func.count()).select_from(Order).where(Order.user_username == "ben")) == 0
+    assert scalar(select(ProductSales.orders_count).where(ProductSales.product_name == "lamp")) == 1
+
+def test_unknown_product_is_not_found():
+    with pytest.raises(HTTPException) as error:
+        create_order("ann", product_name="missing")
+
+    assert error.value.status_code == 404
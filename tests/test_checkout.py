@@ -0,0 +1,81 @@
+"""
+Tests of `OrderService.checkout` when the reservation loses a race.
+
+The catalog cache still sees stock that a concurrent buyer already took; the
+orders are inserted first and the conditional UPDATE then reserves fewer rows
+than expected. The transaction must be rolled back and the 409 must name the
+products that were actually short.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select, update
+
+import models
+from data_access.product import ProductAccess
+from database.config import SessionLocal, engine
+from models.order import Order
+from models.product import Product
+from models.user import User
+from schemes.order import OrderBase
+from services.catalog import product_catalog
+from services.order import OrderService
+
+@pytest.fixture(autouse=True)
+def database():
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    product_catalog.cache.clear()
+
+    db = SessionLocal()
+    try:
+        db.add(User(username="ann", password="hash", email="ann@example.com", name="ann", address="Test Street"))
+        db.add_all([Product(name=name, description=name, price=10, stock=1, created_date=datetime.utcnow())
+                    for name in ("lamp", "desk")])
+        db.commit()
+    finally:
+        db.close()
+
+def checkout(*product_names: str):
+    db = SessionLocal()
+    try:
+        return OrderService(db=db).checkout(items=[OrderBase(product_name=name, notes=None) for name in product_names],
+                                            user_username="ann")
+    finally:
+        db.close()
+
+def execute(statement):
+    db = SessionLocal()
+    try:
+        result = db.execute(statement)
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+def stock(name: str) -> int:
+    return execute(select(Product.stock).where(Product.name == name)).scalar()
+
+def test_checkout_reserves_every_product():
+    orders = checkout("lamp", "desk")
+
+    assert [order.product_name for order in orders] == ["lamp", "desk"]
+    assert stock("lamp") == 0 and stock("desk") == 0
+
+def test_lost_reservation_reports_the_short_products_and_rolls_back():
+    db = SessionLocal()
+    try:
+        product_catalog.get_many(names={"lamp", "desk"}, product_access=ProductAccess(db=db))
+    finally:
+        db.close()
+    execute(update(Product).where(Product.name == "desk").values(stock=0))
+
+    with pytest.raises(HTTPException) as error:
+        checkout("lamp", "desk")
+
+    assert error.value.status_code == 409
+    assert error.value.detail == [{"index": 1, "product_name": "desk", "detail": "Product is out of stock"}]
+    assert stock("lamp") == 1
+    assert execute(select(func.count()).select_from(Order).where(Order.product_name == "lamp")).scalar() == 0
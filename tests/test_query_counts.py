@@ -0,0 +1,91 @@
+"""
+Statement-count regression tests for the routes returning orders with their product.
+
+Each route is called for a user with one order and for a user with several
+orders; the number of SQL statements reported in `X-DB-Query-Count` must be
+the same, so an N+1 pattern, lazy or built from explicit queries, fails here.
+
+Run from the repository root:
+
+    python -m pytest tests
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import models
+from database.config import engine
+from main import app
+
+MANY_ORDERS = 5
+
+def create_user(client: TestClient, username: str) -> dict:
+    """
+    Registers a user and returns the Authorization header of a fresh token.
+    """
+
+    client.post("/v1/users", json={"username": username, "email": f"{username}@example.com",
+                                   "password": "test-password", "name": username, "address": "Test Street"})
+    token = client.post("/token", data={"username": username, "password": "test-password"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+def query_count(response) -> int:
+    assert response.status_code == 200, response.text
+    return int(response.headers["X-DB-Query-Count"])
+
+@pytest.fixture(scope="module")
+def client():
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+
+    with TestClient(app) as test_client:
+        admin = create_user(test_client, "catalog")
+        for index in range(MANY_ORDERS):
+            response = test_client.post("/v1/products", headers=admin, json={
+                "name": f"product-{index}", "description": f"Product {index}", "price": 10 + index, "stock": 100,
+            })
+            assert response.status_code == 200, response.text
+
+        yield test_client
+
+@pytest.fixture(scope="module")
+def users(client):
+    """
+    Creates a user with one order and a user with `MANY_ORDERS` orders.
+
+    Returns:
+    - Per number of orders, the Authorization header and the order ids of the user.
+    """
+
+    created = {}
+    for username, count in (("one", 1), ("many", MANY_ORDERS)):
+        headers = create_user(client, username)
+        order_ids = []
+        for index in range(count):
+            response = client.post("/v1/orders", headers=headers,
+                                   json={"product_name": f"product-{index}", "notes": None})
+            assert response.status_code == 200, response.text
+            order_ids.append(response.json()["order_id"])
+        created[count] = (headers, order_ids)
+
+    return created
+
+def test_detailed_orders_query_count_does_not_grow_with_orders(client, users):
+    one_headers, _ = users[1]
+    many_headers, _ = users[MANY_ORDERS]
+
+    one = client.get("/v1/users/orders/detailed", headers=one_headers)
+    many = client.get("/v1/users/orders/detailed", headers=many_headers)
+
+    assert len(many.json()["items"]) == MANY_ORDERS
+    assert query_count(one) == query_count(many)
+
+def test_order_detail_query_count_does_not_grow_with_orders(client, users):
+    one_headers, one_ids = users[1]
+    many_headers, many_ids = users[MANY_ORDERS]
+
+    one = client.get(f"/v1/orders/{one_ids[0]}", headers=one_headers)
+    many = client.get(f"/v1/orders/{many_ids[-1]}", headers=many_headers)
+
+    assert many.json()["product"]["name"] == f"product-{MANY_ORDERS - 1}"
+    assert query_count(one) == query_count(many)